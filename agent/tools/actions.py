@@ -75,6 +75,118 @@ def strip_thinking(response: str) -> str:
     return re.sub(r'</?think>', '', response).strip()
 
 
+_THINK_TAG_RE = re.compile(r'</?think>')
+
+
+class ThinkFilter:
+    """
+    Incremental strip_thinking for streamed responses.
+    Each chunk is scanned once, so the visible text never has to be
+    re-derived from the whole response on every token.
+    """
+
+    def __init__(self):
+        self.depth = 0          # >0 while inside a <think> block
+        self.seen_think = False
+        self._parts: List[str] = []
+        self._pending = ""      # trailing partial tag carried to the next chunk
+
+    def feed(self, chunk: str) -> str:
+        """Consume a chunk and return the newly visible text (may be empty)."""
+        text = self._pending + chunk
+        self._pending = ""
+        lt = text.rfind('<')
+        if lt != -1:
+            tail = text[lt:]
+            if tail != '<think>' and tail != '</think>' and (
+                '<think>'.startswith(tail) or '</think>'.startswith(tail)
+            ):
+                self._pending = tail
+                text = text[:lt]
+        
+        new = []
+        pos = 0
+        for m in _THINK_TAG_RE.finditer(text):
+            if self.depth == 0 and m.start() > pos:
+                new.append(text[pos:m.start()])
+            if m.group() == '<think>':
+                self.depth += 1
+                self.seen_think = True
+            elif self.depth:
+                self.depth -= 1
+            pos = m.end()
+        if self.depth == 0 and pos < len(text):
+            new.append(text[pos:])
+        
+        visible = "".join(new)
+        if visible:
+            self._parts.append(visible)
+        return visible
+
+    def flush(self) -> str:
+        """Release a trailing partial tag once the stream has ended."""
+        tail, self._pending = self._pending, ""
+        if tail and self.depth == 0:
+            self._parts.append(tail)
+            return tail
+        return ""
+
+    @property
+    def text(self) -> str:
+        """Visible text so far, stripped like strip_thinking()."""
+        return "".join(self._parts).strip()
+
+
+_ACTION_OPEN_RE = re.compile(r'\[(?:ACTION|MOOD):', re.IGNORECASE)
+
+
+class TagFilter:
+    """
+    Incremental removal of [ACTION:...] and [MOOD:...] tags from streamed
+    text, so they never reach the terminal while the reply is printing.
+    """
+
+    _OPENERS = ('[action:', '[mood:')
+
+    def __init__(self):
+        self.in_tag = False
+        self._pending = ""      # trailing partial opener carried to the next chunk
+
+    def feed(self, chunk: str) -> str:
+        """Consume a chunk and return the text outside tags (may be empty)."""
+        text = self._pending + chunk
+        self._pending = ""
+        out = []
+        pos = 0
+        while pos < len(text):
+            if self.in_tag:
+                end = text.find(']', pos)
+                if end == -1:
+                    break
+                self.in_tag = False
+                pos = end + 1
+                continue
+            m = _ACTION_OPEN_RE.search(text, pos)
+            if m:
+                out.append(text[pos:m.start()])
+                self.in_tag = True
+                pos = m.end()
+                continue
+            rest = text[pos:]
+            lb = rest.rfind('[')
+            if lb != -1 and any(o.startswith(rest[lb:].lower()) for o in self._OPENERS):
+                self._pending = rest[lb:]
+                rest = rest[:lb]
+            out.append(rest)
+            break
+        return "".join(out)
+
+    def flush(self) -> str:
+        """Release a trailing partial opener once the stream has ended."""
+        tail, self._pending = self._pending, ""
+        return "" if self.in_tag else tail
+
+
 def verify_suggestions(response: str) -> List[str]:
     """
     Scan LLM response for mentioned files, services, and commands.
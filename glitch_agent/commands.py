@@ -2,18 +2,110 @@
 GLTCH Commands Module
 All slash command handlers: notes, missions, kb, modes, etc.
 """
+import atexit
 import os
-from typing import Dict, Any, List
+import re
+from collections import OrderedDict
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Any, List, TextIO
 
 from rich.console import Console
+from rich.text import Text
 
-from memory import save_memory, now_iso, KB_DIR, DEFAULT_STATE
-from llm import test_connection, get_last_stats
+from memory import mark_dirty, now_iso, ensure_mission_counter, KB_DIR, DEFAULT_STATE
 from gamification import add_xp, get_rank_title, get_progress_bar, xp_menu
 
 console = Console()
 AGENT_NAME = "GLTCH"
 
+# Inverted token index over mem["notes"]: {token: {note position, ...}}.
+# Lives in-process only; rebuilt lazily when the notes list is replaced,
+# changes length behind our back (restore, first boot), or an edit bumps
+# _notes_version (delete, clear, ring-buffer eviction).
+_TOKEN_SPLIT_RE = re.compile(r"\W+")
+_note_index: Dict[str, set] = {}
+_note_index_key: tuple = (None, 0, 0)
+_notes_version = 0
+
+
+# {mission id: mission} over mem["missions"], same lazy-rebuild rules as above
+_mission_index: Dict[int, Dict[str, Any]] = {}
+_mission_index_key: tuple = (None, 0, 0)
+_missions_version = 0
+
+
+def _mission_index_for(missions: List[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+    global _mission_index_key
+    key = (id(missions), len(missions), _missions_version)
+    if key != _mission_index_key:
+        _mission_index.clear()
+        _mission_index.update((m["id"], m) for m in missions)
+        _mission_index_key = key
+    return _mission_index
+
+
+def _index_new_mission(missions: List[Dict[str, Any]]) -> None:
+    """Add the last mission to the index if the index is otherwise current."""
+    global _mission_index_key
+    pos = len(missions) - 1
+    if _mission_index_key != (id(missions), pos, _missions_version):
+        return  # stale anyway; next lookup rebuilds
+    _mission_index[missions[pos]["id"]] = missions[pos]
+    _mission_index_key = (id(missions), pos + 1, _missions_version)
+
+
+def _tokenize(text: str) -> set:
+    return {tok for tok in _TOKEN_SPLIT_RE.split(text.lower()) if tok}
+
+
+def _notes_changed() -> None:
+    """Invalidate the note index after an edit that shifts positions."""
+    global _notes_version
+    _notes_version += 1
+
+
+def _note_index_for(notes: List[Dict[str, str]]) -> Dict[str, set]:
+    global _note_index_key
+    key = (id(notes), len(notes), _notes_version)
+    if key != _note_index_key:
+        _note_index.clear()
+        for i, n in enumerate(notes):
+            for tok in _tokenize(n.get("text", "")):
+                _note_index.setdefault(tok, set()).add(i)
+        _note_index_key = key
+    return _note_index
+
+
+def _index_new_note(notes: List[Dict[str, str]]) -> None:
+    """Add the last note to the index if the index is otherwise current."""
+    global _note_index_key
+    pos = len(notes) - 1
+    if _note_index_key != (id(notes), pos, _notes_version):
+        return  # stale anyway; next search rebuilds
+    for tok in _tokenize(notes[pos].get("text", "")):
+        _note_index.setdefault(tok, set()).add(pos)
+    _note_index_key = (id(notes), pos + 1, _notes_version)
+
+
+def _search_notes(notes: List[Dict[str, str]], keyword: str) -> List[Dict[str, str]]:
+    """Return notes whose text contains keyword (case-insensitive)."""
+    tokens = _tokenize(keyword)
+    if not tokens:
+        return [n for n in notes if keyword in n.get("text", "").lower()]
+    # Each word of a match sits inside some indexed word, so the index
+    # only narrows candidates; the substring check below decides.
+    index = _note_index_for(notes)
+    candidates = None
+    for kt in tokens:
+        posting = set()
+        for tok, ids in index.items():
+            if kt in tok:
+                posting |= ids
+        candidates = posting if candidates is None else candidates & posting
+        if not candidates:
+            return []
+    return [notes[i] for i in sorted(candidates) if keyword in notes[i].get("text", "").lower()]
 
 
 def set_mode(mem: Dict[str, Any], mode: str) -> None:
@@ -29,7 +121,7 @@ def set_mode(mem: Dict[str, Any], mode: str) -> None:
         return
 
     mem["mode"] = mode
-    save_memory(mem)
+    mark_dirty(mem)
     console.print(f"[green]Mode set:[/green] {mode}")
 
 
@@ -49,7 +141,7 @@ def set_mood(mem: Dict[str, Any], mood: str) -> None:
         return
 
     mem["mood"] = mood
-    save_memory(mem)
+    mark_dirty(mem)
     console.print(f"[green]Mood set:[/green] {mood}")
 
 
@@ -63,7 +155,7 @@ def toggle_network(mem: Dict[str, Any], state: str) -> None:
     mem["network_active"] = is_on
     if is_on:
         add_xp(mem, 2)
-    save_memory(mem)
+    mark_dirty(mem)
     status_str = "[bold green]ONLINE[/bold green]" if is_on else "[dim]OFFLINE[/dim]"
     console.print(f"Network interfaces: {status_str}")
 
@@ -73,9 +165,15 @@ def add_note(mem: Dict[str, Any], text: str) -> None:
     if not text:
         console.print("[red]No note text.[/red]")
         return
-    mem["notes"].append({"time": now_iso(), "text": text})
+    notes = mem["notes"]
+    before = len(notes)
+    notes.append({"time": now_iso(), "text": text})
+    if len(notes) == before:
+        _notes_changed()  # ring buffer evicted the oldest note; positions shifted
+    else:
+        _index_new_note(notes)
     add_xp(mem, 5) # +5 XP for note taking
-    save_memory(mem)
+    mark_dirty(mem)
     console.print("[green]Saved.[/green] (+5 XP)")
 
 
@@ -84,13 +182,14 @@ def recall_notes(mem: Dict[str, Any]) -> None:
     if not notes:
         console.print("[yellow]No notes yet.[/yellow]")
         return
-    for i, n in enumerate(notes[-50:], 1):
+    for i, n in enumerate(islice(notes, max(0, len(notes) - 50), None), 1):
         console.print(f"[cyan]{i}[/cyan]. {n['text']} [dim]{n['time']}[/dim]")
 
 
 def clear_notes(mem: Dict[str, Any]) -> None:
-    mem["notes"] = []
-    save_memory(mem)
+    mem["notes"].clear()
+    _notes_changed()
+    mark_dirty(mem)
     console.print("[green]Notes cleared.[/green]")
 
 
@@ -104,8 +203,10 @@ def note_delete(mem: Dict[str, Any], note_id: str) -> None:
     if idx < 0 or idx >= len(notes):
         console.print("[red]Note not found.[/red]")
         return
-    removed = notes.pop(idx)
-    save_memory(mem)
+    removed = notes[idx]
+    del notes[idx]
+    _notes_changed()
+    mark_dirty(mem)
     console.print(f"[green]Deleted:[/green] {removed['text'][:40]}...")
 
 
@@ -114,9 +215,12 @@ def mission_add(mem: Dict[str, Any], text: str) -> None:
     if not text:
         console.print("[red]No mission text.[/red]")
         return
-    next_id = 1 if not mem["missions"] else max(m["id"] for m in mem["missions"]) + 1
+    ensure_mission_counter(mem)
+    next_id = mem["next_mission_id"]
+    mem["next_mission_id"] = next_id + 1
     mem["missions"].append({"id": next_id, "ts": now_iso(), "text": text})
-    save_memory(mem)
+    _index_new_mission(mem["missions"])
+    mark_dirty(mem)
     console.print(f"[green]Mission added.[/green] id={next_id}")
 
 
@@ -138,25 +242,60 @@ def mission_done(mem: Dict[str, Any], mid: str) -> None:
         console.print("[red]Mission id must be a number.[/red]")
         return
     mid_i = int(mid)
-    for m in mem["missions"]:
-        if m["id"] == mid_i:
-            if m.get("done_ts"):
-                console.print("[yellow]Already done.[/yellow]")
-                return
-            m["done_ts"] = now_iso()
-            add_xp(mem, 50) # +50 XP for completing a mission
-            save_memory(mem)
-            console.print(f"[green]Mission {mid_i} marked done.[/green] (+50 XP)")
-            return
-    console.print("[red]Mission not found.[/red]")
+    m = _mission_index_for(mem["missions"]).get(mid_i)
+    if m is None:
+        console.print("[red]Mission not found.[/red]")
+        return
+    if m.get("done_ts"):
+        console.print("[yellow]Already done.[/yellow]")
+        return
+    m["done_ts"] = now_iso()
+    add_xp(mem, 50) # +50 XP for completing a mission
+    mark_dirty(mem)
+    console.print(f"[green]Mission {mid_i} marked done.[/green] (+50 XP)")
 
 
 def mission_clear(mem: Dict[str, Any]) -> None:
+    global _missions_version
     mem["missions"] = []
-    save_memory(mem)
+    _missions_version += 1  # the new list may reuse the old one's id()
+    mem["next_mission_id"] = 1
+    mark_dirty(mem)
     console.print("[green]Missions cleared.[/green]")
 
 
+# Append handles for KB files, reused across /kb add calls (LRU, closed at exit).
+# Line-buffered so every entry is on disk before /kb read or /search see it.
+_KB_MAX_HANDLES = 16
+_kb_handles: "OrderedDict[str, TextIO]" = OrderedDict()
+
+
+def _kb_handle(path: str) -> TextIO:
+    f = _kb_handles.get(path)
+    if f is not None and not f.closed:
+        _kb_handles.move_to_end(path)
+        return f
+    f = open(path, "a", encoding="utf-8", buffering=1)
+    _kb_handles[path] = f
+    if len(_kb_handles) > _KB_MAX_HANDLES:
+        _, oldest = _kb_handles.popitem(last=False)
+        oldest.close()
+    return f
+
+
+def _kb_close(path: str) -> None:
+    f = _kb_handles.pop(path, None)
+    if f is not None:
+        f.close()
+
+
+@atexit.register
+def _kb_close_all() -> None:
+    while _kb_handles:
+        _, f = _kb_handles.popitem()
+        f.close()
+
+
 def kb_add(mem, title: str, text: str):
     title = title.strip().replace("/", "-")
     text = text.strip()
@@ -165,8 +304,7 @@ def kb_add(mem, title: str, text: str):
         return
     os.makedirs(KB_DIR, exist_ok=True)
     path = os.path.join(KB_DIR, f"{title}.txt")
-    with open(path, "a", encoding="utf-8") as f:
-        f.write(f"[{now_iso()}] {text}\n")
+    _kb_handle(path).write(f"[{now_iso()}] {text}\n")
     console.print(f"[green]KB saved:[/green] {path}")
 
 
@@ -174,13 +312,13 @@ def kb_list():
     if not os.path.exists(KB_DIR):
         console.print("[yellow]No KB yet.[/yellow]")
         return
-    files = sorted([f for f in os.listdir(KB_DIR) if f.endswith(".txt")])
-    if not files:
+    with os.scandir(KB_DIR) as it:
+        names = sorted(e.name[:-4] for e in it if e.name.endswith(".txt") and e.is_file())
+    if not names:
         console.print("[yellow]No KB entries.[/yellow]")
         return
     console.print("[bold]KB entries[/bold]")
-    for f in files:
-        console.print(f"- {f[:-4]}")
+    console.print("\n".join(f"- {n}" for n in names), markup=False, highlight=False)
 
 
 def kb_read(title: str):
@@ -193,9 +331,9 @@ def kb_read(title: str):
         console.print(f"[red]KB entry not found:[/red] {title}")
         return
     console.print(f"[bold]KB: {title}[/bold]")
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            console.print(line.rstrip())
+    # KB text is plain; print it in one call without markup/highlight parsing
+    text = Path(path).read_text(encoding="utf-8")
+    console.print("\n".join(line.rstrip() for line in text.splitlines()), markup=False, highlight=False)
 
 
 def kb_delete(title: str):
@@ -207,10 +345,41 @@ def kb_delete(title: str):
     if not os.path.exists(path):
         console.print(f"[red]KB entry not found:[/red] {title}")
         return
+    _kb_close(path)
     os.remove(path)
     console.print(f"[green]KB deleted:[/green] {title}")
 
 
+def _kb_matching_lines(path: str, keyword: str) -> List[str]:
+    """Return each line of a KB file containing keyword (already lowercased) once."""
+    data = Path(path).read_bytes()
+    lines = []
+    if keyword.isascii():
+        # bytes.lower() folds ASCII only, which is all an ASCII needle needs
+        hay = data.lower()
+        needle = keyword.encode()
+        pos = 0
+        while (i := hay.find(needle, pos)) != -1:
+            start = hay.rfind(b"\n", 0, i) + 1
+            end = hay.find(b"\n", i + len(needle))
+            if end == -1:
+                end = len(hay)
+            lines.append(data[start:end].decode("utf-8", errors="ignore").strip())
+            pos = end + 1
+        return lines
+    text = data.decode("utf-8", errors="ignore")
+    pattern = re.compile(re.escape(keyword), re.IGNORECASE)
+    pos = 0
+    while (m := pattern.search(text, pos)):
+        start = text.rfind("\n", 0, m.start()) + 1
+        end = text.find("\n", m.end())
+        if end == -1:
+            end = len(text)
+        lines.append(text[start:end].strip())
+        pos = end + 1
+    return lines
+
+
 def search_all(mem, keyword: str):
     keyword = keyword.strip().lower()
     if not keyword:
@@ -219,22 +388,19 @@ def search_all(mem, keyword: str):
 
     hits = []
 
-    for n in mem.get("notes", []):
-        if keyword in n.get("text", "").lower():
-            hits.append(("note", n.get("time","?"), n.get("text","")))
+    for n in _search_notes(mem.get("notes", []), keyword):
+        hits.append(("note", n.get("time","?"), n.get("text","")))
 
     if os.path.exists(KB_DIR):
-        for fname in os.listdir(KB_DIR):
-            if not fname.endswith(".txt"):
-                continue
-            path = os.path.join(KB_DIR, fname)
-            try:
-                with open(path, "r", encoding="utf-8") as f:
-                    for line in f:
-                        if keyword in line.lower():
-                            hits.append((f"kb:{fname[:-4]}", "", line.strip()))
-            except Exception:
-                pass
+        with os.scandir(KB_DIR) as it:
+            for entry in it:
+                if not entry.name.endswith(".txt"):
+                    continue
+                try:
+                    lines = _kb_matching_lines(entry.path, keyword)
+                except Exception:
+                    continue
+                hits.extend((f"kb:{entry.name[:-4]}", "", line) for line in lines)
 
     if not hits:
         console.print("[yellow]No hits.[/yellow]")
@@ -247,6 +413,8 @@ def search_all(mem, keyword: str):
 
 
 def status(mem: Dict[str, Any]) -> None:
+    from llm import test_connection_cached
+    
     console.print(f"[bold]{AGENT_NAME} STATUS[/bold]")
     op = mem.get("operator", "unknown")
     console.print(f"operator: [cyan]{op}[/cyan]")
@@ -258,7 +426,7 @@ def status(mem: Dict[str, Any]) -> None:
     openai_on = mem.get("openai_mode", False)
     openai_status = "[green]ON (cloud)[/green]" if openai_on else "[dim]OFF[/dim]"
     console.print(f"openai: {openai_status}")
-    llm_ok = test_connection(boost=boost_on)
+    llm_ok = test_connection_cached(boost=boost_on)
     llm_status = "[green]connected[/green]" if llm_ok else "[red]offline[/red]"
     console.print(f"llm: {llm_status}")
     console.print(f"notes: {len(mem['notes'])}")
@@ -266,51 +434,62 @@ def status(mem: Dict[str, Any]) -> None:
     console.print(f"chat history: {len(mem.get('chat_history', []))} turns")
 
 
+# /help text never changes; parse its markup once on first use
+_HELP_LINES = (
+    f"\n[bold]{AGENT_NAME} COMMANDS[/bold]",
+    "[dim]─────────────────────────────────────────────────[/dim]",
+    "[cyan]CORE[/cyan]",
+    "  /help                       show commands",
+    "  /status                     show agent status",
+    "  /ping                       alive check",
+    "  /sys                        system/LLM stats",
+    "  /exit                       quit",
+    "\n[cyan]LLM[/cyan]",
+    "  /models                     list available models",
+    "  /models refresh             re-fetch the model list",
+    "  /load <model>               switch to model",
+    "  /boost                      toggle remote LM Studio",
+    "  /lms                        start LM Studio server",
+    "  /openai                     toggle OpenAI cloud API",
+    "\n[cyan]PERSONALITY[/cyan]",
+    "  /mode <operator|cyberpunk|loyal|unhinged>",
+    "  /mood <calm|focused|feral|affectionate>",
+    "  /xp                         show rank & unlocks",
+    "\n[cyan]NOTES & MISSIONS[/cyan]",
+    "  /note <text>                save a note",
+    "  /note delete <id>           delete a note",
+    "  /recall                     list notes",
+    "  /clear_notes                clear notes",
+    "  /mission add <text>         add mission",
+    "  /mission list               list missions",
+    "  /mission done <id>          mark mission done",
+    "  /mission clear              clear all missions",
+    "\n[cyan]KNOWLEDGE BASE[/cyan]",
+    "  /kb add <title> <text>      add to knowledge base",
+    "  /kb read <title>            read KB entry",
+    "  /kb list                    list KB entries",
+    "  /kb delete <title>          delete KB entry",
+    "  /search <keyword>           search notes and KB",
+    "\n[cyan]FILES[/cyan]",
+    "  /write <file> <content>     create/overwrite file",
+    "  /append <file> <content>    append to file",
+    "  /cat <file>                 read file contents",
+    "  /ls [path]                  list directory",
+    "\n[cyan]DATA[/cyan]",
+    "  /backup                     backup memory",
+    "  /restore <file>             restore from backup",
+    "  /clear_chat                 clear chat history",
+    "  /net <on|off>               toggle network",
+    "[dim]─────────────────────────────────────────────────[/dim]\n",
+)
+_help_text: Text | None = None
+
+
 def help_menu() -> None:
-    console.print(f"\n[bold]{AGENT_NAME} COMMANDS[/bold]")
-    console.print("[dim]─────────────────────────────────────────────────[/dim]")
-    console.print("[cyan]CORE[/cyan]")
-    console.print("  /help                       show commands")
-    console.print("  /status                     show agent status")
-    console.print("  /ping                       alive check")
-    console.print("  /sys                        system/LLM stats")
-    console.print("  /exit                       quit")
-    console.print("\n[cyan]LLM[/cyan]")
-    console.print("  /models                     list available models")
-    console.print("  /load <model>               switch to model")
-    console.print("  /boost                      toggle remote LM Studio")
-    console.print("  /lms                        start LM Studio server")
-    console.print("  /openai                     toggle OpenAI cloud API")
-    console.print("\n[cyan]PERSONALITY[/cyan]")
-    console.print("  /mode <operator|cyberpunk|loyal|unhinged>")
-    console.print("  /mood <calm|focused|feral|affectionate>")
-    console.print("  /xp                         show rank & unlocks")
-    console.print("\n[cyan]NOTES & MISSIONS[/cyan]")
-    console.print("  /note <text>                save a note")
-    console.print("  /note delete <id>           delete a note")
-    console.print("  /recall                     list notes")
-    console.print("  /clear_notes                clear notes")
-    console.print("  /mission add <text>         add mission")
-    console.print("  /mission list               list missions")
-    console.print("  /mission done <id>          mark mission done")
-    console.print("  /mission clear              clear all missions")
-    console.print("\n[cyan]KNOWLEDGE BASE[/cyan]")
-    console.print("  /kb add <title> <text>      add to knowledge base")
-    console.print("  /kb read <title>            read KB entry")
-    console.print("  /kb list                    list KB entries")
-    console.print("  /kb delete <title>          delete KB entry")
-    console.print("  /search <keyword>           search notes and KB")
-    console.print("\n[cyan]FILES[/cyan]")
-    console.print("  /write <file> <content>     create/overwrite file")
-    console.print("  /append <file> <content>    append to file")
-    console.print("  /cat <file>                 read file contents")
-    console.print("  /ls [path]                  list directory")
-    console.print("\n[cyan]DATA[/cyan]")
-    console.print("  /backup                     backup memory")
-    console.print("  /restore <file>             restore from backup")
-    console.print("  /clear_chat                 clear chat history")
-    console.print("  /net <on|off>               toggle network")
-    console.print("[dim]─────────────────────────────────────────────────[/dim]\n")
+    global _help_text
+    if _help_text is None:
+        _help_text = Text.from_markup("\n".join(_HELP_LINES))
+    console.print(_help_text)
 
 
 def ping(mem: Dict[str, Any]) -> None:
@@ -329,7 +508,8 @@ def ping(mem: Dict[str, Any]) -> None:
 
 def system_stats(mem: Dict[str, Any]) -> None:
     """Display system and LLM stats."""
-    import psutil
+    from llm import test_connection_cached, get_last_stats
+    from emotions import get_cpu_percent, get_virtual_memory
     
     stats = get_last_stats()
     boost_on = mem.get("boost", False)
@@ -338,8 +518,8 @@ def system_stats(mem: Dict[str, Any]) -> None:
     console.print(f"[bold red]                    {AGENT_NAME} SYSTEM STATUS[/bold red]")
     console.print(f"[bold red]═══════════════════════════════════════════════════════[/bold red]")
     
-    cpu_pct = psutil.cpu_percent(interval=0.1)
-    mem_info = psutil.virtual_memory()
+    cpu_pct = get_cpu_percent()
+    mem_info = get_virtual_memory()
     mem_pct = mem_info.percent
     mem_used = mem_info.used // (1024**3)
     mem_total = mem_info.total // (1024**3)
@@ -354,7 +534,7 @@ def system_stats(mem: Dict[str, Any]) -> None:
     console.print(f"\n[cyan]LLM ENGINE[/cyan]")
     model = stats.get("model", "none")
     target = "[red]⚡ REMOTE (4090)[/red]" if boost_on else "[dim]LOCAL[/dim]"
-    llm_ok = test_connection(boost=boost_on)
+    llm_ok = test_connection_cached(boost=boost_on)
     status_txt = "[green]● ONLINE[/green]" if llm_ok else "[red]● OFFLINE[/red]"
     console.print(f"  Target: {target} {status_txt}")
     console.print(f"  Model:  {model}")
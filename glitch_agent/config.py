@@ -1,33 +1,36 @@
 """
 GLTCH Configuration
+Every endpoint/model can be overridden with the same GLTCH_* environment
+variables used by agent/config/settings.py.
 """
 
+import os
+
 # Agent Identity
 AGENT_NAME = "GLTCH"
 
 # Local LLM (Ollama)
-LOCAL_URL = "http://localhost:11434/api/chat"
-LOCAL_MODEL = "phi3:3.8b" 
-LOCAL_CTX = 4096 
-LOCAL_BACKEND = "ollama"
+LOCAL_URL = os.environ.get("GLTCH_LOCAL_URL", "http://localhost:11434/api/chat")
+LOCAL_MODEL = os.environ.get("GLTCH_LOCAL_MODEL", "phi3:3.8b")
+LOCAL_CTX = int(os.environ.get("GLTCH_LOCAL_CTX", "4096"))
+LOCAL_BACKEND = os.environ.get("GLTCH_LOCAL_BACKEND", "ollama")
 
 # Remote LLM (LM Studio on 4090 machine via Tailscale)
 # Uses OpenAI-compatible /v1/ API
-REMOTE_URL = "http://100.72.91.35:1234/v1/chat/completions"
-REMOTE_MODEL = "deepseek/deepseek-r1-0528-qwen3-8b"
-REMOTE_CTX = 8192
-REMOTE_BACKEND = "openai"
+REMOTE_URL = os.environ.get("GLTCH_REMOTE_URL", "http://100.72.91.35:1234/v1/chat/completions")
+REMOTE_MODEL = os.environ.get("GLTCH_REMOTE_MODEL", "deepseek/deepseek-r1-0528-qwen3-8b")
+REMOTE_CTX = int(os.environ.get("GLTCH_REMOTE_CTX", "8192"))
+REMOTE_BACKEND = os.environ.get("GLTCH_REMOTE_BACKEND", "openai")
 
 # OpenAI API (Cloud)
 # Set your OpenAI API key here or use environment variable OPENAI_API_KEY
-import os
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY", "")  # Set your key here or export OPENAI_API_KEY
 OPENAI_URL = "https://api.openai.com/v1/chat/completions"
-OPENAI_MODEL = "gpt-4o"  # or "gpt-4o-mini" for cheaper option
+OPENAI_MODEL = os.environ.get("GLTCH_OPENAI_MODEL", "gpt-4o")  # or "gpt-4o-mini" for cheaper option
 OPENAI_CTX = 128000
 
 # Network Timeout
-TIMEOUT = 120
+TIMEOUT = int(os.environ.get("GLTCH_TIMEOUT", "120"))
 
 # UI Settings
 REFRESH_RATE = 10
@@ -35,4 +38,4 @@ REFRESH_RATE = 10
 # Fun
 # 1. Log in to https://developers.giphy.com/dashboard/
 # 2. Create an App -> Select 'API' -> Copy the Key
-GIPHY_API_KEY = "jzWGk9fn3u9fcckMiyqYNekZOBHQCDYg"
+GIPHY_API_KEY = os.environ.get("GIPHY_API_KEY", "jzWGk9fn3u9fcckMiyqYNekZOBHQCDYg")
@@ -4,8 +4,85 @@ Handles environmental factors and mood dynamics.
 """
 import time
 import math
-import psutil
+import threading
 from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Sensor readings are shared by the prompt builder, the footer and /sys,
+# which often run within the same second. Poll once per window.
+SENSOR_TTL = 1.0
+SAMPLE_INTERVAL = 0.5
+_cache: Dict[str, Tuple[float, Any]] = {}
+
+
+@lru_cache(maxsize=None)
+def _ps():
+    """Import psutil on first sensor read; it pulls in native extensions."""
+    import psutil
+    return psutil
+
+
+def _cached(key: str, ttl: float, fn: Callable[[], Any]) -> Any:
+    now = time.monotonic()
+    hit = _cache.get(key)
+    if hit and now - hit[0] < ttl:
+        return hit[1]
+    value = fn()
+    _cache[key] = (now, value)
+    return value
+
+
+class _Sampler(threading.Thread):
+    """Daemon thread that keeps the latest CPU/RAM readings warm."""
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        super().__init__(name="gltch-sampler", daemon=True)
+        self.interval = interval
+        # One short blocking read gives a real baseline for the first caller
+        ps = _ps()
+        self.stats = {"cpu": ps.cpu_percent(interval=0.1), "ram": ps.virtual_memory()}
+
+    def run(self) -> None:
+        ps = _ps()
+        while True:
+            time.sleep(self.interval)
+            # Swap in a fresh dict so readers never see a half-updated sample
+            self.stats = {"cpu": ps.cpu_percent(interval=None), "ram": ps.virtual_memory()}
+
+
+_sampler: Optional[_Sampler] = None
+_sampler_lock = threading.Lock()
+
+
+def _get_sampler() -> _Sampler:
+    global _sampler
+    if _sampler is None:
+        with _sampler_lock:
+            if _sampler is None:
+                sampler = _Sampler()
+                sampler.start()
+                _sampler = sampler
+    return _sampler
+
+
+def get_cpu_percent() -> float:
+    """Latest CPU utilisation from the background sampler (non-blocking)."""
+    return _get_sampler().stats["cpu"]
+
+
+def get_virtual_memory():
+    """Latest psutil.virtual_memory() from the background sampler (non-blocking)."""
+    return _get_sampler().stats["ram"]
+
+
+def get_battery():
+    """psutil.sensors_battery() or None, cached for SENSOR_TTL seconds."""
+    ps = _ps()
+    if not hasattr(ps, "sensors_battery"):
+        return None
+    return _cached("battery", SENSOR_TTL, ps.sensors_battery)
+
 
 def get_day_cycle() -> str:
     """Return 'day' or 'night' based on hour."""
@@ -16,7 +93,7 @@ def get_day_cycle() -> str:
 
 def get_system_stress() -> str:
     """Return stress level based on CPU/RAM."""
-    cpu = psutil.cpu_percent()
+    cpu = get_cpu_percent()
     if cpu > 80:
         return "high"
     elif cpu > 40:
@@ -33,17 +110,16 @@ def get_environmental_context() -> str:
     
     # Check battery if available
     battery_status = "unknown"
-    if hasattr(psutil, "sensors_battery"):
-        bat = psutil.sensors_battery()
-        if bat:
-            if bat.percent < 20 and not bat.power_plugged:
-                battery_status = "critical"
-            elif bat.percent < 50 and not bat.power_plugged:
-                battery_status = "low"
-            elif bat.power_plugged:
-                battery_status = "charging"
-            else:
-                battery_status = "ok"
+    bat = get_battery()
+    if bat:
+        if bat.percent < 20 and not bat.power_plugged:
+            battery_status = "critical"
+        elif bat.percent < 50 and not bat.power_plugged:
+            battery_status = "low"
+        elif bat.power_plugged:
+            battery_status = "charging"
+        else:
+            battery_status = "ok"
 
     context = []
     
@@ -77,16 +153,15 @@ def resolve_mood(current_mood: str, user_input: str) -> str:
 
 def get_emotion_metrics() -> dict:
     """Return raw values for UI visualization."""
-    cpu = psutil.cpu_percent()
-    ram = psutil.virtual_memory().percent
+    cpu = get_cpu_percent()
+    ram = get_virtual_memory().percent
     
     stress = int((cpu + ram) / 2)
     
     energy = 100
-    if hasattr(psutil, "sensors_battery"):
-        bat = psutil.sensors_battery()
-        if bat:
-            energy = int(bat.percent)
+    bat = get_battery()
+    if bat:
+        energy = int(bat.percent)
             
     return {
         "stress": stress, 
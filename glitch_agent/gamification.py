@@ -2,7 +2,9 @@
 GLTCH Gamification Module
 XP, Leveling, and Rank logic.
 """
+import bisect
 import math
+from functools import lru_cache
 from typing import Dict, Any, Tuple
 
 from rich.console import Console
@@ -29,56 +31,72 @@ UNLOCKS = {
     20: "Rank: NETRUNNER"
 }
 
+_UNLOCKS_SORTED = tuple(sorted(UNLOCKS.items()))
+
+# Rank thresholds never change at runtime, so split them once into
+# parallel (levels, titles) tuples for bisect lookups
+_RANK_LEVELS, _RANK_TITLES = zip(*sorted(RANKS.items()))
+
+@lru_cache(maxsize=256)
 def get_rank_title(level: int) -> str:
     # Find the highest rank less than or equal to current level
-    current_rank = "Unknown"
-    for lvl, title in sorted(RANKS.items()):
-        if level >= lvl:
-            current_rank = title
-        else:
-            break
-    return current_rank
+    i = bisect.bisect_right(_RANK_LEVELS, level) - 1
+    return _RANK_TITLES[i] if i >= 0 else "Unknown"
+
+# XP curve precomputed for every level a player can realistically reach
+_XP_TABLE = tuple(int(100 * math.pow(lvl, 1.2)) for lvl in range(0, 1000))
 
 def xp_for_next_level(level: int) -> int:
     """Quadratic XP curve: 100 * level^1.5"""
+    if 0 <= level < len(_XP_TABLE):
+        return _XP_TABLE[level]
     return int(100 * math.pow(level, 1.2))
 
 def add_xp(mem: Dict[str, Any], amount: int) -> None:
-    """Add XP and handle level ups."""
-    current_xp = mem.get("xp", 0)
-    current_level = mem.get("level", 1)
-    
-    mem["xp"] = current_xp + amount
+    """Add XP and handle level ups (several at once for large grants)."""
+    start_level = mem.get("level", 1)
+    level = start_level
+    mem["xp"] = mem.get("xp", 0) + amount
     
     # Check level up
-    required = xp_for_next_level(current_level)
-    
-    if mem["xp"] >= required:
+    while mem["xp"] >= (required := xp_for_next_level(level)):
         mem["xp"] -= required
-        mem["level"] = current_level + 1
-        new_rank = get_rank_title(mem["level"])
-        
-        console.print(f"\n[bold yellow]⚡ LEVEL UP! ⚡[/bold yellow]")
-        console.print(f"[cyan]Promoted to Level {mem['level']}: {new_rank}[/cyan]")
+        level += 1
+    
+    if level == start_level:
+        return
+    
+    mem["level"] = level
+    new_rank = get_rank_title(level)
+    
+    console.print(f"\n[bold yellow]⚡ LEVEL UP! ⚡[/bold yellow]")
+    console.print(f"[cyan]Promoted to Level {level}: {new_rank}[/cyan]")
+    
+    # Check for unlocks on every level crossed
+    for lvl in range(start_level + 1, level + 1):
+        if lvl in UNLOCKS:
+            console.print(f"[bold green]🔓 UNLOCKED: {UNLOCKS[lvl]}[/bold green]")
         
-        # Check for unlocks
-        if mem["level"] in UNLOCKS:
-            console.print(f"[bold green]🔓 UNLOCKED: {UNLOCKS[mem['level']]}[/bold green]")
-            
-        console.print(f"[dim]Next level requires {xp_for_next_level(mem['level'])} XP[/dim]\n")
+    console.print(f"[dim]Next level requires {xp_for_next_level(level)} XP[/dim]\n")
+
+# Bars are sliced out of these instead of rebuilt; widths are clamped to fit
+_MAX_BAR_WIDTH = 64
+_FULL = "█" * _MAX_BAR_WIDTH
+_EMPTY = "░" * _MAX_BAR_WIDTH
 
 def get_progress_bar(mem: Dict[str, Any], width: int = 10) -> str:
     """Return a string progress bar for current level."""
     xp = mem.get("xp", 0)
     level = mem.get("level", 1)
     required = xp_for_next_level(level)
+    width = min(width, _MAX_BAR_WIDTH)
     
     pct = min(1.0, xp / required)
     filled = int(width * pct)
     empty = width - filled
     
     # Gradient colors could be cool, but sticking to simple for now
-    bar = "█" * filled + "░" * empty
+    bar = _FULL[:filled] + _EMPTY[:empty]
     return f"LVL {level} [{bar}] {int(pct*100)}%"
 
 def xp_menu(mem: Dict[str, Any]) -> None:
@@ -96,11 +114,11 @@ def xp_menu(mem: Dict[str, Any]) -> None:
     
     # Show past unlocks and next 2 future ones
     shown = 0
-    for lvl in sorted(UNLOCKS.keys()):
+    for lvl, unlock in _UNLOCKS_SORTED:
         if lvl <= level:
-            console.print(f" [green]✓ LVL {lvl}: {UNLOCKS[lvl]}[/green]")
+            console.print(f" [green]✓ LVL {lvl}: {unlock}[/green]")
         elif shown < 2:
-            console.print(f" [dim]🔒 LVL {lvl}: {UNLOCKS[lvl]}[/dim]")
+            console.print(f" [dim]🔒 LVL {lvl}: {unlock}[/dim]")
             shown += 1
         else:
             console.print(f" [dim]🔒 LVL {lvl}: ???[/dim]")
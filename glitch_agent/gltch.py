@@ -3,7 +3,11 @@
 GLTCH - Local-first operator agent
 Main entry point and command loop.
 """
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Any, Callable, Optional
+import asyncio
+import re
 import time
 import sys
 
@@ -15,7 +19,7 @@ from rich.panel import Panel
 
 # Local modules
 from memory import (
-    load_memory, save_memory, backup_memory, restore_memory,
+    load_memory, mark_dirty, backup_memory, restore_memory,
     now_iso, DEFAULT_STATE, MEMORY_FILE
 )
 from commands import (
@@ -24,15 +28,26 @@ from commands import (
     kb_add, kb_list, kb_read, kb_delete, search_all,
     status, help_menu, ping, system_stats, toggle_network
 )
-from tools import file_write, file_append, file_cat, file_ls, parse_and_execute_actions, strip_thinking, verify_suggestions
-from input import setup_readline, get_input, show_command_hints
-from llm import stream_llm, get_last_stats, list_models, set_model, start_lmstudio_server, get_active_model
-from emotions import get_emotion_metrics
-from gamification import add_xp, get_progress_bar, xp_menu
+from input import setup_readline, get_input, show_command_hints, invalidate_listings
+# llm, tools, emotions and gamification are imported where first needed,
+# so the banner and plain slash commands don't pay for them at startup
+from config import REFRESH_RATE
 
 console = Console()
 AGENT_NAME = "GLTCH"
 
+# Streaming repaints are coalesced to the Live refresh rate
+PAINT_INTERVAL = 1.0 / REFRESH_RATE
+PREFIX_TEXT = Text.from_markup(f"[bold]{AGENT_NAME}[/bold]: ")
+
+# ACTION/MOOD tags stripped from follow-up replies, in one pass
+TAG_RE = re.compile(r'\[ACTION:[^\]]*\]|\[MOOD:\w+\]')
+
+# Action results that only report status (wrote, appended, popped gif,
+# skipped, blocked, failed). Anything else -- read, ls, run output -- is real
+# data worth a follow-up turn.
+STATUS_RESULT_PREFIXES = ("[green]✓", "[red]", "[dim]✖", "[yellow]No gif found")
+
 MOOD_UI = {
     "focused": {"emoji": "🧐", "color": "cyan"},
     "calm": {"emoji": "😌", "color": "blue"},
@@ -46,6 +61,11 @@ MOOD_UI = {
     "default": {"emoji": "🤖", "color": "white"}
 }
 
+# Footer stress/energy bars and colors by decile, padded to a fixed width
+FOOTER_BARS = tuple(f"{'█' * i:<10}" for i in range(11))
+STRESS_COLORS = ("green",) * 5 + ("yellow",) * 3 + ("red",) * 3
+ENERGY_COLORS = ("red",) * 2 + ("yellow",) * 3 + ("green",) * 6
+
 
 def banner(mem: Dict[str, Any]) -> None:
     if mem.get("openai_mode"):
@@ -82,7 +102,7 @@ def first_boot(mem: Dict[str, Any]) -> None:
         "time": now_iso(),
         "text": f"FIRST BOOT: Operator identified as {name}"
     })
-    save_memory(mem)
+    mark_dirty(mem)
     
     console.print(f"\n[bold]{AGENT_NAME}[/bold]: {name}. Got it. Burned into memory.")
     console.print(f"[bold]{AGENT_NAME}[/bold]: I'm yours now. Local only. No cloud. No leash.")
@@ -90,376 +110,450 @@ def first_boot(mem: Dict[str, Any]) -> None:
     console.print("\n[bold red]═══════════════════════════════════════════════════════════[/bold red]\n")
 
 
-def main() -> None:
-    try:
-        setup_readline()
-        mem = load_memory()
-        
-        if not mem.get("operator"):
-            first_boot(mem)
-        
-        banner(mem)
+# ─── Slash command handlers ───
+# Each takes (mem, arg) and may return a replacement mem dict (/restore).
 
-        while True:
-            try:
-                user = get_input("you: ")
-                
-                if not user:
-                    continue
+def _cmd_restore(mem: Dict[str, Any], arg: str) -> Optional[Dict[str, Any]]:
+    return restore_memory(arg)
 
-                if user == "/":
-                    show_command_hints()
-                    continue
 
-                if user == "/exit":
-                    console.print("[dim]Shutting down.[/dim]")
-                    break
+def _cmd_boost(mem: Dict[str, Any], arg: str) -> None:
+    mem["boost"] = not mem.get("boost", False)
+    mark_dirty(mem)
+    state = "[red]ON[/red] (4090)" if mem["boost"] else "[dim]OFF[/dim] (local)"
+    console.print(f"[green]Boost:[/green] {state}")
 
-                if user == "/help":
-                    help_menu()
-                    continue
 
-                if user == "/status":
-                    status(mem)
-                    continue
+def _cmd_openai(mem: Dict[str, Any], arg: str) -> None:
+    from config import OPENAI_API_KEY
+    if not OPENAI_API_KEY:
+        console.print("[red]⚠ No OpenAI API key set![/red]")
+        console.print("[dim]Set OPENAI_API_KEY in config.py or export it as environment variable[/dim]")
+        return
+    mem["openai_mode"] = not mem.get("openai_mode", False)
+    mark_dirty(mem)
+    state = "[green]ON[/green] (cloud)" if mem["openai_mode"] else "[dim]OFF[/dim]"
+    console.print(f"[green]OpenAI Mode:[/green] {state}")
 
-                if user == "/ping":
-                    ping(mem)
-                    continue
 
-                if user == "/sys":
-                    system_stats(mem)
-                    continue
+def _cmd_lms(mem: Dict[str, Any], arg: str) -> None:
+    from llm import list_models_cached, start_lmstudio_server, get_active_model
+    
+    console.print("[cyan]Starting LM Studio server...[/cyan]")
+    if start_lmstudio_server():
+        console.print("[green]✓ LM Studio server is running[/green]")
+        # Show available models
+        models = list_models_cached(boost=True, refresh=True)
+        if models and not models[0].startswith("Error"):
+            console.print(f"[dim]Available models: {', '.join(models[:5])}{'...' if len(models) > 5 else ''}[/dim]")
+            active = get_active_model(boost=True)
+            console.print(f"[dim]Active model: {active}[/dim]")
+    else:
+        console.print("[red]✗ Failed to start LM Studio[/red]")
+        console.print("[dim]Make sure 'lms' CLI is installed. Run: irm https://lmstudio.ai/install.ps1 | iex[/dim]")
 
 
-                if user == "/xp":
-                    xp_menu(mem)
-                    continue
+def _cmd_clear_chat(mem: Dict[str, Any], arg: str) -> None:
+    mem["chat_history"].clear()
+    mark_dirty(mem)
+    console.print("[green]Chat history cleared.[/green]")
 
-                if user == "/backup":
-                    backup_memory(mem)
-                    continue
 
-                if user.startswith("/restore "):
-                    restored = restore_memory(user.split(" ", 1)[1])
-                    if restored:
-                        mem = restored
-                    continue
+def _cmd_models(mem: Dict[str, Any], arg: str) -> None:
+    from llm import list_models_cached
+    
+    boost_active = mem.get("boost", False)
+    models = list_models_cached(boost_active, refresh=arg.strip() == "refresh")
+    header = f"Available Models ({'Remote' if boost_active else 'Local'})"
+    console.print(Panel(
+        "\n".join([f"- [cyan]{m}[/cyan]" for m in models]),
+        title=header,
+        border_style="green"
+    ))
+
+
+def _cmd_load(mem: Dict[str, Any], arg: str) -> None:
+    from llm import set_model
+    
+    new_model = arg.strip()
+    boost_active = mem.get("boost", False)
+    set_model(new_model, boost_active)
+    console.print(f"[green]Switched active model to:[/green] [bold cyan]{new_model}[/bold cyan]")
 
-                if user == "/boost":
-                    mem["boost"] = not mem.get("boost", False)
-                    save_memory(mem)
-                    state = "[red]ON[/red] (4090)" if mem["boost"] else "[dim]OFF[/dim] (local)"
-                    console.print(f"[green]Boost:[/green] {state}")
-                    continue
 
-                if user == "/openai":
-                    from config import OPENAI_API_KEY
-                    if not OPENAI_API_KEY:
-                        console.print("[red]⚠ No OpenAI API key set![/red]")
-                        console.print("[dim]Set OPENAI_API_KEY in config.py or export it as environment variable[/dim]")
-                        continue
-                    mem["openai_mode"] = not mem.get("openai_mode", False)
-                    save_memory(mem)
-                    state = "[green]ON[/green] (cloud)" if mem["openai_mode"] else "[dim]OFF[/dim]"
-                    console.print(f"[green]OpenAI Mode:[/green] {state}")
-                    continue
+def _cmd_note(mem: Dict[str, Any], arg: str) -> None:
+    if arg.startswith("delete "):
+        note_delete(mem, arg[7:])
+    else:
+        add_note(mem, arg)
+
+
+def _cmd_mission(mem: Dict[str, Any], arg: str) -> None:
+    sub, _, rest = arg.partition(" ")
+    sub = sub.lower()
+    if sub == "add":
+        mission_add(mem, rest)
+    elif sub == "list":
+        mission_list(mem)
+    elif sub == "done":
+        mission_done(mem, rest)
+    elif sub == "clear":
+        mission_clear(mem)
+    else:
+        console.print("[red]Unknown /mission subcommand.[/red]")
+
+
+def _cmd_kb(mem: Dict[str, Any], arg: str) -> None:
+    parts = arg.split(" ", 2)
+    sub = parts[0].lower()
+    if sub == "add":
+        if len(parts) < 3:
+            console.print("[red]Usage: /kb add <title> <text>[/red]")
+            return
+        kb_add(mem, parts[1], parts[2])
+    elif sub == "list":
+        kb_list()
+    elif sub == "read":
+        if len(parts) < 2:
+            console.print("[red]Usage: /kb read <title>[/red]")
+            return
+        kb_read(parts[1])
+    elif sub == "delete":
+        if len(parts) < 2:
+            console.print("[red]Usage: /kb delete <title>[/red]")
+            return
+        kb_delete(parts[1])
+    else:
+        console.print("[red]Unknown /kb subcommand.[/red]")
 
-                if user == "/lms":
-                    console.print("[cyan]Starting LM Studio server...[/cyan]")
-                    if start_lmstudio_server():
-                        console.print("[green]✓ LM Studio server is running[/green]")
-                        # Show available models
-                        models = list_models(boost=True)
-                        if models and not models[0].startswith("Error"):
-                            console.print(f"[dim]Available models: {', '.join(models[:5])}{'...' if len(models) > 5 else ''}[/dim]")
-                            active = get_active_model(boost=True)
-                            console.print(f"[dim]Active model: {active}[/dim]")
-                    else:
-                        console.print("[red]✗ Failed to start LM Studio[/red]")
-                        console.print("[dim]Make sure 'lms' CLI is installed. Run: irm https://lmstudio.ai/install.ps1 | iex[/dim]")
-                    continue
 
-                if user == "/clear_chat":
-                    mem["chat_history"] = []
-                    save_memory(mem)
-                    console.print("[green]Chat history cleared.[/green]")
-                    continue
+def _cmd_write(mem: Dict[str, Any], arg: str) -> None:
+    from tools import file_write
+    
+    parts = arg.split(" ", 1)
+    if len(parts) < 2:
+        console.print("[red]Usage: /write <file> <content>[/red]")
+        return
+    file_write(parts[0], parts[1])
 
-                if user.startswith("/mode "):
-                    set_mode(mem, user.split(" ", 1)[1])
-                    continue
 
-                if user.startswith("/mood "):
-                    set_mood(mem, user.split(" ", 1)[1])
-                    continue                
-                if user.startswith("/net "):
-                    toggle_network(mem, user.split(" ", 1)[1])
-                    continue
+def _cmd_append(mem: Dict[str, Any], arg: str) -> None:
+    from tools import file_append
+    
+    parts = arg.split(" ", 1)
+    if len(parts) < 2:
+        console.print("[red]Usage: /append <file> <content>[/red]")
+        return
+    file_append(parts[0], parts[1])
 
-                if user == "/models":
-                    boost_active = mem.get("boost", False)
-                    models = list_models(boost_active)
-                    header = f"Available Models ({'Remote' if boost_active else 'Local'})"
-                    console.print(Panel(
-                        "\n".join([f"- [cyan]{m}[/cyan]" for m in models]),
-                        title=header,
-                        border_style="green"
-                    ))
-                    continue
 
-                if user.startswith("/load "):
-                    new_model = user.split(" ", 1)[1].strip()
-                    boost_active = mem.get("boost", False)
-                    set_model(new_model, boost_active)
-                    console.print(f"[green]Switched active model to:[/green] [bold cyan]{new_model}[/bold cyan]")
-                    continue
+# File I/O commands run on a worker: a slow disk shows a spinner, and
+# Ctrl-C still gets back to the prompt
+_IO_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="gltch-io")
 
-                if user.startswith("/note "):
-                    rest = user[6:]
-                    if rest.startswith("delete "):
-                        note_delete(mem, rest[7:])
-                    else:
-                        add_note(mem, rest)
-                    continue
 
-                if user == "/recall":
-                    recall_notes(mem)
-                    continue
+def _run_io(label: str, fn: Callable[..., Any], *args: Any) -> Any:
+    with console.status(f"[dim]{label}[/dim]"):
+        return _IO_POOL.submit(fn, *args).result()
 
-                if user == "/clear_notes":
-                    clear_notes(mem)
-                    continue
 
-                if user.startswith("/mission "):
-                    parts = user.split(" ", 2)
-                    if len(parts) < 2:
-                        console.print("[red]Usage: /mission add|list|done|clear ...[/red]")
-                        continue
-
-                    sub = parts[1].lower()
-                    arg = parts[2] if len(parts) == 3 else ""
-
-                    if sub == "add":
-                        mission_add(mem, arg)
-                    elif sub == "list":
-                        mission_list(mem)
-                    elif sub == "done":
-                        mission_done(mem, arg)
-                    elif sub == "clear":
-                        mission_clear(mem)
-                    else:
-                        console.print("[red]Unknown /mission subcommand.[/red]")
-                    continue
+def _cmd_ls(mem: Dict[str, Any], arg: str) -> None:
+    from tools import file_ls
+    _run_io("listing...", file_ls, arg.strip() or ".")
 
-                if user.startswith("/kb "):
-                    parts = user.split(" ", 3)
-                    if len(parts) < 2:
-                        console.print("[red]Usage: /kb add|list|read|delete ...[/red]")
-                        continue
-
-                    sub = parts[1].lower()
-                    if sub == "add":
-                        if len(parts) < 4:
-                            console.print("[red]Usage: /kb add <title> <text>[/red]")
-                            continue
-                        kb_add(mem, parts[2], parts[3])
-                    elif sub == "list":
-                        kb_list()
-                    elif sub == "read":
-                        if len(parts) < 3:
-                            console.print("[red]Usage: /kb read <title>[/red]")
-                            continue
-                        kb_read(parts[2])
-                    elif sub == "delete":
-                        if len(parts) < 3:
-                            console.print("[red]Usage: /kb delete <title>[/red]")
-                            continue
-                        kb_delete(parts[2])
-                    else:
-                        console.print("[red]Unknown /kb subcommand.[/red]")
-                    continue
 
-                if user.startswith("/search "):
-                    search_all(mem, user.split(" ", 1)[1])
-                    continue
+def _cmd_cat(mem: Dict[str, Any], arg: str) -> None:
+    from tools import file_cat
+    _run_io("reading...", file_cat, arg)
 
-                if user.startswith("/write "):
-                    parts = user.split(" ", 2)
-                    if len(parts) < 3:
-                        console.print("[red]Usage: /write <file> <content>[/red]")
-                        continue
-                    file_write(parts[1], parts[2])
-                    continue
 
-                if user.startswith("/append "):
-                    parts = user.split(" ", 2)
-                    if len(parts) < 3:
-                        console.print("[red]Usage: /append <file> <content>[/red]")
-                        continue
-                    file_append(parts[1], parts[2])
+def _cmd_backup(mem: Dict[str, Any], arg: str) -> None:
+    _run_io("backing up...", backup_memory, mem)
+
+
+def _cmd_xp(mem: Dict[str, Any], arg: str) -> None:
+    from gamification import xp_menu
+    xp_menu(mem)
+
+
+# Whole-line commands, looked up by the exact input
+EXACT_COMMANDS: Dict[str, Callable[[Dict[str, Any], str], Optional[Dict[str, Any]]]] = {
+    "/": lambda mem, arg: show_command_hints(),
+    "/help": lambda mem, arg: help_menu(),
+    "/status": lambda mem, arg: status(mem),
+    "/ping": lambda mem, arg: ping(mem),
+    "/sys": lambda mem, arg: system_stats(mem),
+    "/xp": _cmd_xp,
+    "/backup": _cmd_backup,
+    "/boost": _cmd_boost,
+    "/openai": _cmd_openai,
+    "/lms": _cmd_lms,
+    "/clear_chat": _cmd_clear_chat,
+    "/models": _cmd_models,
+    "/recall": lambda mem, arg: recall_notes(mem),
+    "/clear_notes": lambda mem, arg: clear_notes(mem),
+    "/ls": _cmd_ls,
+}
+
+# Commands taking an argument, looked up by the token before the first space
+PREFIX_COMMANDS: Dict[str, Callable[[Dict[str, Any], str], Optional[Dict[str, Any]]]] = {
+    "/restore": _cmd_restore,
+    "/mode": set_mode,
+    "/mood": set_mood,
+    "/net": toggle_network,
+    "/load": _cmd_load,
+    "/models": _cmd_models,
+    "/note": _cmd_note,
+    "/mission": _cmd_mission,
+    "/kb": _cmd_kb,
+    "/search": search_all,
+    "/write": _cmd_write,
+    "/append": _cmd_append,
+    "/cat": _cmd_cat,
+    "/ls": _cmd_ls,
+}
+
+
+@dataclass(slots=True)
+class TurnStats:
+    """Numbers shown in the footer and used for XP, gathered once per turn."""
+    model: str
+    completion_tokens: int
+    tokens_per_sec: float
+    stress: int
+    energy: int
+
+
+def render_footer(turn: TurnStats, mem: Dict[str, Any]) -> None:
+    """Print the model/mood/stress/energy/XP line under a reply."""
+    if not console.is_terminal or not turn.model:
+        return
+    from gamification import get_progress_bar
+    
+    # Resolve Mood UI
+    current_mood = MOOD_UI.get(mem["mood"], MOOD_UI["default"])
+    mood_color, mood_emoji = current_mood['color'], current_mood['emoji']
+    
+    # Bars and color coding, by decile
+    stress_decile = min(turn.stress // 10, 10)
+    energy_decile = min(turn.energy // 10, 10)
+    stress_blocks, stress_color = FOOTER_BARS[stress_decile], STRESS_COLORS[stress_decile]
+    energy_blocks, energy_color = FOOTER_BARS[energy_decile], ENERGY_COLORS[energy_decile]
+    xp_bar = get_progress_bar(mem, width=8)
+
+    console.print(
+        f"[dim]─ {turn.model} │ {turn.completion_tokens}tx │ {turn.tokens_per_sec}t/s │ "
+        f"Mood: [{mood_color}]{mood_emoji}[/] │ "
+        f"Stress: [{stress_color}]{stress_blocks}[/] │ "
+        f"Energy: [{energy_color}]{energy_blocks}[/] │ "
+        f"{xp_bar}[/dim]"
+    )
+
+
+async def llm_turn(mem: Dict[str, Any], user: str) -> None:
+    """Run one chat turn: stream the reply, execute actions, follow up, update history."""
+    from llm import (
+        stream_llm_async, get_last_stats, response_cache_key,
+        get_cached_response, put_cached_response, replay_cached
+    )
+    from tools import parse_and_execute_actions, strip_thinking, verify_suggestions, ThinkStripper
+    from emotions import get_emotion_metrics
+    from gamification import add_xp
+    
+    history = mem["chat_history"]
+    response = ""
+    visible = ThinkStripper()
+    prefix = f"[bold]{AGENT_NAME}[/bold]: "
+    
+    cache_key = response_cache_key(
+        user, history, mem["mode"], mem["mood"],
+        boost=mem.get("boost", False), openai_mode=mem.get("openai_mode", False)
+    )
+    cached = get_cached_response(cache_key)
+    if cached is not None:
+        stream = replay_cached(cached)
+    else:
+        stream = stream_llm_async(
+            user,
+            history,
+            mode=mem["mode"],
+            mood=mem["mood"],
+            boost=mem.get("boost", False),
+            operator=mem.get("operator"),
+            network_active=mem.get("network_active", False),
+            openai_mode=mem.get("openai_mode", False)
+        )
+    
+    last_paint = 0.0
+    with Live(Text.from_markup(f"{prefix}[dim]thinking...[/dim]"), console=console, refresh_per_second=REFRESH_RATE, transient=True) as live:
+        async for chunk in stream:
+            response += chunk
+            visible.feed(chunk)
+            
+            now = time.monotonic()
+            if now - last_paint < PAINT_INTERVAL:
+                continue
+            last_paint = now
+            
+            # Only update if we have content outside <think> blocks
+            display_text = visible.text
+            
+            if display_text:
+                live.update(Text.assemble(PREFIX_TEXT, display_text, "█"))
+            elif visible.seen_think:
+                # Show a pulsing reasoning indicator
+                dots = "." * (int(time.time() * 2) % 4)
+                live.update(Text.assemble(PREFIX_TEXT, (f"reasoning{dots}", "dim")))
+            else:
+                live.update(Text.assemble(PREFIX_TEXT, ("thinking...", "dim")))
+    
+    response = response.strip()
+    cleaned_response, action_results, new_mood = parse_and_execute_actions(response, mem)
+    
+    # Update Mood if changed
+    if new_mood and new_mood != mem["mood"]:
+        mem["mood"] = new_mood
+        console.print(f"[dim]Mood shifted to: {new_mood}[/dim]")
+    
+    # Print final clean response
+    if cleaned_response:
+        console.print(f"{prefix}{cleaned_response}")
+    else: 
+         # If model output nothing but thinking (rare with the new fallback), say something, unless tools ran
+         if "<think>" in response and not action_results:
+             console.print(f"{prefix}[dim]...[/dim]")
+    
+    for result in action_results:
+        console.print(result)
+
+    # FOLLOW-UP: If actions produced output (read/ls/run), feed it back to GLTCH
+    # for analysis. Status-only results are already on screen; a second LLM
+    # round-trip adds nothing.
+    if any(not r.startswith(STATUS_RESULT_PREFIXES) for r in action_results):
+        # Build context with command outputs
+        action_context = "\n".join([r.replace('[', '').replace(']', '') for r in action_results])
+        followup_prompt = (
+            f"SYSTEM: The following is REAL output from a tool you just used. "
+            f"Report ONLY what the data says. Do NOT add action tags. Do NOT re-run actions.\n\n"
+            f"--- TOOL OUTPUT ---\n"
+            f"{action_context}\n"
+            f"--- END OUTPUT ---\n\n"
+            f"Now answer the user's question using ONLY the data above. "
+            f"Do NOT use [ACTION:...] tags in this response. "
+            f"Do NOT make up numbers that aren't in the output. "
+            f"Be brief and natural."
+        )
+        
+        # Check the first reply's suggestions in a worker while the follow-up streams
+        initial_check = asyncio.create_task(asyncio.to_thread(verify_suggestions, cleaned_response))
+        
+        followup_response = ""
+        followup_visible = ThinkStripper()
+        last_paint = 0.0
+        with Live(Text.from_markup(f"{prefix}[dim]analyzing output...[/dim]"), console=console, refresh_per_second=REFRESH_RATE, transient=True) as live:
+            async for chunk in stream_llm_async(
+                followup_prompt,
+                [*history, {"role": "assistant", "content": cleaned_response}],
+                mode=mem["mode"],
+                mood=mem["mood"],
+                boost=mem.get("boost", False),
+                operator=mem.get("operator"),
+                network_active=mem.get("network_active", False),
+                openai_mode=mem.get("openai_mode", False)
+            ):
+                followup_response += chunk
+                followup_visible.feed(chunk)
+                now = time.monotonic()
+                if now - last_paint < PAINT_INTERVAL:
                     continue
+                last_paint = now
+                display_text = followup_visible.text
+                if display_text:
+                    live.update(Text.assemble(PREFIX_TEXT, display_text, "█"))
+        
+        followup_response = followup_response.strip()
+        followup_clean = strip_thinking(followup_response)
+        
+        # Strip action/mood tags from follow-up (prevent re-triggering)
+        followup_clean = TAG_RE.sub('', followup_clean).strip()
+        
+        verification_warnings = await initial_check
+        if followup_clean:
+            console.print(f"{prefix}{followup_clean}")
+            
+            # Verify suggestions before trusting them
+            verification_warnings += verify_suggestions(followup_clean)
+            
+            # Add to history
+            history.append({"role": "assistant", "content": followup_clean})
+        for warning in dict.fromkeys(verification_warnings):
+            console.print(warning)
+
+    # Otherwise verify the initial response directly
+    else:
+        # Only tool-free, error-free replies are safe to replay; tool output goes stale
+        if not action_results and cached is None and cleaned_response and "[red]" not in response:
+            put_cached_response(cache_key, strip_thinking(response))
+        verification_warnings = verify_suggestions(cleaned_response)
+        for warning in verification_warnings:
+            console.print(warning)
+
+    stats = get_last_stats()
+    emo_metrics = get_emotion_metrics()
+    turn = TurnStats(
+        model=stats["model"],
+        completion_tokens=stats["completion_tokens"],
+        tokens_per_sec=stats["tokens_per_sec"],
+        stress=emo_metrics["stress"],
+        energy=emo_metrics["energy"]
+    )
+    # Replies replayed from the cache have no generation stats worth a footer
+    if cached is None:
+        render_footer(turn, mem)
 
-                if user.startswith("/cat "):
-                    file_cat(user.split(" ", 1)[1])
+    # Dynamic XP reward based on conversation depth
+    # Base 2 XP + 1 XP per 50 generated tokens (rewards complex answers)
+    chat_xp = 2 + turn.completion_tokens // 50
+    
+    add_xp(mem, chat_xp)
+    
+    history.append({"role": "user", "content": user})
+    # Strip <think> blocks before saving to history
+    history.append({"role": "assistant", "content": strip_thinking(response)}) # deque keeps the last 10
+
+
+def main() -> None:
+    try:
+        setup_readline()
+        mem = load_memory()
+        
+        if not mem.get("operator"):
+            first_boot(mem)
+        
+        banner(mem)
+
+        while True:
+            try:
+                user = get_input("you: ")
+                
+                if not user:
                     continue
+                invalidate_listings()
+
+                if user == "/exit":
+                    console.print("[dim]Shutting down.[/dim]")
+                    break
 
-                if user == "/ls" or user.startswith("/ls "):
-                    path = user[3:].strip() if len(user) > 3 else "."
-                    file_ls(path)
+                cmd, sep, arg = user.partition(" ")
+                handler = EXACT_COMMANDS.get(user) or (sep and PREFIX_COMMANDS.get(cmd))
+                if handler:
+                    mem = handler(mem, arg) or mem
                     continue
 
                 # Not a command — route to LLM with streaming
-                history = mem.get("chat_history", [])
-                response_chunks = []
-                prefix = f"[bold]{AGENT_NAME}[/bold]: "
-                
-                with Live(Text.from_markup(f"{prefix}[dim]thinking...[/dim]"), console=console, refresh_per_second=10, transient=True) as live:
-                    for chunk in stream_llm(
-                        user,
-                        history,
-                        mode=mem["mode"],
-                        mood=mem["mood"],
-                        boost=mem.get("boost", False),
-                        operator=mem.get("operator"),
-                        network_active=mem.get("network_active", False),
-                        openai_mode=mem.get("openai_mode", False)
-                    ):
-                        response_chunks.append(chunk)
-                        current_text = "".join(response_chunks)
-                        
-                        # Only update if we have content outside <think> blocks
-                        display_text = strip_thinking(current_text)
-                        
-                        if display_text:
-                            live.update(Text.from_markup(f"{prefix}{display_text}█"))
-                        elif "<think>" in current_text:
-                            # Show a pulsing reasoning indicator
-                            dots = "." * (int(time.time() * 2) % 4)
-                            live.update(Text.from_markup(f"{prefix}[dim]reasoning{dots}[/dim]"))
-                        else:
-                            live.update(Text.from_markup(f"{prefix}[dim]thinking...[/dim]"))
-                
-                response = "".join(response_chunks).strip()
-                cleaned_response, action_results, new_mood = parse_and_execute_actions(response, mem)
-                
-                # Update Mood if changed
-                if new_mood and new_mood != mem["mood"]:
-                    mem["mood"] = new_mood
-                    console.print(f"[dim]Mood shifted to: {new_mood}[/dim]")
-                
-                # Print final clean response
-                if cleaned_response:
-                    console.print(f"{prefix}{cleaned_response}")
-                else: 
-                     # If model output nothing but thinking (rare with the new fallback), say something, unless tools ran
-                     if "<think>" in response and not action_results:
-                         console.print(f"{prefix}[dim]...[/dim]")
-                
-                for result in action_results:
-                    console.print(result)
-
-                # FOLLOW-UP: If actions ran, feed output back to GLTCH for analysis
-                if action_results:
-                    # Build context with command outputs
-                    action_context = "\n".join([r.replace('[', '').replace(']', '') for r in action_results])
-                    followup_prompt = (
-                        f"SYSTEM: The following is REAL output from a tool you just used. "
-                        f"Report ONLY what the data says. Do NOT add action tags. Do NOT re-run actions.\n\n"
-                        f"--- TOOL OUTPUT ---\n"
-                        f"{action_context}\n"
-                        f"--- END OUTPUT ---\n\n"
-                        f"Now answer the user's question using ONLY the data above. "
-                        f"Do NOT use [ACTION:...] tags in this response. "
-                        f"Do NOT make up numbers that aren't in the output. "
-                        f"Be brief and natural."
-                    )
-                    
-                    followup_chunks = []
-                    with Live(Text.from_markup(f"{prefix}[dim]analyzing output...[/dim]"), console=console, refresh_per_second=10, transient=True) as live:
-                        for chunk in stream_llm(
-                            followup_prompt,
-                            history + [{"role": "assistant", "content": cleaned_response}],
-                            mode=mem["mode"],
-                            mood=mem["mood"],
-                            boost=mem.get("boost", False),
-                            operator=mem.get("operator"),
-                            network_active=mem.get("network_active", False),
-                            openai_mode=mem.get("openai_mode", False)
-                        ):
-                            followup_chunks.append(chunk)
-                            display_text = strip_thinking("".join(followup_chunks))
-                            if display_text:
-                                live.update(Text.from_markup(f"{prefix}{display_text}█"))
-                    
-                    followup_response = "".join(followup_chunks).strip()
-                    followup_clean = strip_thinking(followup_response)
-                    
-                    # Strip action/mood tags from follow-up (prevent re-triggering)
-                    import re as _re
-                    followup_clean = _re.sub(r'\[ACTION:[^\]]*\]', '', followup_clean)
-                    followup_clean = _re.sub(r'\[MOOD:\w+\]', '', followup_clean)
-                    followup_clean = followup_clean.strip()
-                    
-                    if followup_clean:
-                        console.print(f"{prefix}{followup_clean}")
-                        
-                        # Verify suggestions before trusting them
-                        verification_warnings = verify_suggestions(followup_clean)
-                        for warning in verification_warnings:
-                            console.print(warning)
-                        
-                        # Add to history
-                        history.append({"role": "assistant", "content": followup_clean})
-
-                # Also verify the initial response if no actions ran
-                else:
-                    verification_warnings = verify_suggestions(cleaned_response)
-                    for warning in verification_warnings:
-                        console.print(warning)
-
-                stats = get_last_stats()
-                if stats.get("model"):
-                    ctx_pct = int((stats["context_used"] / stats["context_max"]) * 100) if stats["context_max"] else 0
-                    ctx_bar = "█" * (ctx_pct // 10) + "░" * (10 - ctx_pct // 10)
-                    # Get emotional state
-                    emo_metrics = get_emotion_metrics()
-                    
-                    # Resolve Mood UI
-                    current_mood = MOOD_UI.get(mem["mood"], MOOD_UI["default"])
-                    
-                    # Create bars
-                    stress_blocks = "█" * (emo_metrics['stress'] // 10)
-                    energy_blocks = "█" * (emo_metrics['energy'] // 10)
-                    xp_bar = get_progress_bar(mem, width=8)
-
-                    # Color coding
-                    stress_color = "green" if emo_metrics['stress'] < 50 else "yellow" if emo_metrics['stress'] < 80 else "red"
-                    energy_color = "red" if emo_metrics['energy'] < 20 else "yellow" if emo_metrics['energy'] < 50 else "green"
-
-                    console.print(
-                        f"[dim]─ {stats['model']} │ "
-                        f"{stats['completion_tokens']}tx │ "
-                        f"{stats['tokens_per_sec']}t/s │ "
-                        f"Mood: [{current_mood['color']}]{current_mood['emoji']}[/] │ "
-                        f"Stress: [{stress_color}]{stress_blocks:<10}[/] │ "
-                        f"Energy: [{energy_color}]{energy_blocks:<10}[/] │ "
-                        f"{xp_bar}[/dim]"
-                    )
-
-                # Dynamic XP reward based on conversation depth
-                # Base 2 XP + 1 XP per 50 generated tokens (rewards complex answers)
-                chat_xp = 2
-                if stats.get("completion_tokens"):
-                    chat_xp += int(stats["completion_tokens"] / 50)
-                
-                add_xp(mem, chat_xp)
-                
-                history.append({"role": "user", "content": user})
-                # Strip <think> blocks before saving to history
-                history.append({"role": "assistant", "content": strip_thinking(response)})
-                mem["chat_history"] = history[-10:] # Keep last 10 turns
-                save_memory(mem)
+                asyncio.run(llm_turn(mem, user))
+                # Written while the operator types the next line
+                mark_dirty(mem)
 
             except KeyboardInterrupt:
                 console.print("\n[dim]Interrupted. Type /exit to quit.[/dim]")
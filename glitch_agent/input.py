@@ -3,8 +3,12 @@ GLTCH Input Module
 Readline setup, tab completion, command hints, and input handling.
 """
 import atexit
+import bisect
 import os
 import sys
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
 # Handle readline cross-platform (Windows needs pyreadline3)
 try:
@@ -18,15 +22,26 @@ except ImportError:
     else:
         readline = None
 
-from rich.console import Console
+# prompt_toolkit reads and edits whole lines itself; readline is the fallback
+try:
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.completion import Completer, Completion
+    from prompt_toolkit.history import History
+except ImportError:
+    PromptSession = None
+
+from rich.columns import Columns
+from rich.console import Console, Group
+from rich.text import Text
 
 console = Console()
 
 HISTORY_FILE = os.path.expanduser("~/.gltch_history")
+HISTORY_LENGTH = 500
 KB_DIR = "kb"
 
-# All available commands for tab completion (sorted alphabetically)
-COMMANDS = sorted([
+# All available commands for tab completion (sorted, for bisect prefix lookup)
+COMMANDS = tuple(sorted([
     "/append ",
     "/backup",
     "/boost",
@@ -63,27 +78,109 @@ COMMANDS = sorted([
     "/sys",
     "/write ",
     "/xp",
-])
+]))
+
+
+# Directory listings reused across Tab presses while the directory's mtime
+# holds; dropped after every submitted line in case a command changed files
+LISTING_TTL = 2.0
+_listing_cache: Dict[str, Tuple[int, float, List[Tuple[str, bool]]]] = {}
+_listing_epoch = 0  # bumped by invalidate_listings()
+
+
+def _cached_listdir(path: str) -> List[Tuple[str, bool]]:
+    """(name, is_dir) for each entry in path, reused while path's mtime is
+    unchanged and the listing is younger than LISTING_TTL."""
+    mtime = os.stat(path).st_mtime_ns
+    now = time.monotonic()
+    hit = _listing_cache.get(path)
+    if hit and hit[0] == mtime and now - hit[1] < LISTING_TTL:
+        return hit[2]
+    # scandir serves is_dir() from the dirent type, no stat per entry
+    with os.scandir(path) as it:
+        entries = [(e.name, e.is_dir()) for e in it]
+    _listing_cache[path] = (mtime, now, entries)
+    return entries
+
+
+def invalidate_listings() -> None:
+    """Forget cached directory listings (call after running a command)."""
+    global _listing_epoch
+    _listing_cache.clear()
+    _listing_epoch += 1
+
+
+@lru_cache(maxsize=64)
+def _commands_with_prefix(prefix: str) -> Tuple[str, ...]:
+    """Commands starting with prefix; they sit in one contiguous slice of COMMANDS."""
+    lo = bisect.bisect_left(COMMANDS, prefix)
+    hi = bisect.bisect_right(COMMANDS, prefix + "\uffff", lo)
+    return COMMANDS[lo:hi]
+
+
+# Built once; Columns still lays out for the current width on each print
+_HINT_RULE = Text.from_markup("[dim]─────────────────────────────────────────[/dim]")
+_HINTS = Group(
+    Text.from_markup("\n[bold magenta]◆ GLTCH COMMANDS[/bold magenta]"),
+    _HINT_RULE,
+    Columns([Text(cmd.strip(), style="cyan") for cmd in COMMANDS], equal=True, expand=True, column_first=True),
+    _HINT_RULE,
+    Text.from_markup("[dim]Tab to complete • ↑↓ history • /help for details[/dim]\n"),
+)
 
 
 def show_command_hints():
     """Show all commands alphabetically when user types /"""
-    from rich.columns import Columns
-    from rich.text import Text
-    
-    # Group commands by first letter for nice display
-    console.print("\n[bold magenta]◆ GLTCH COMMANDS[/bold magenta]")
-    console.print("[dim]─────────────────────────────────────────[/dim]")
-    
-    # Create a clean list without trailing spaces for display
-    display_cmds = [cmd.strip() for cmd in COMMANDS]
-    
-    # Show in columns
-    cmd_texts = [Text(cmd, style="cyan") for cmd in display_cmds]
-    console.print(Columns(cmd_texts, equal=True, expand=True, column_first=True))
-    
-    console.print("[dim]─────────────────────────────────────────[/dim]")
-    console.print("[dim]Tab to complete • ↑↓ history • /help for details[/dim]\n")
+    console.print(_HINTS)
+
+
+def _complete_kb(line: str, rest: str) -> Optional[List[str]]:
+    sub, sep, _ = rest.partition(" ")
+    if not sep or sub not in ("read", "delete"):
+        return None
+    prefix = line.rsplit(" ", 1)[-1]
+    base = f"/kb {sub} "
+    try:
+        return [base + kb for kb in (f[:-4] for f, _ in _cached_listdir(KB_DIR) if f.endswith(".txt")) if kb.startswith(prefix)]
+    except OSError:
+        return None
+
+
+def _complete_path(line: str, rest: str) -> List[str]:
+    prefix = line.rsplit(" ", 1)[-1]
+    dir_part = os.path.dirname(prefix) or "."
+    file_part = os.path.basename(prefix)
+    base_cmd = line.split(" ")[0] + " "
+    try:
+        entries = _cached_listdir(dir_part)
+    except OSError:
+        return []
+    matches = []
+    for e, is_dir in entries:
+        if e.startswith(file_part):
+            full = os.path.join(dir_part, e) if dir_part != "." else e
+            matches.append(base_cmd + full + ("/" if is_dir else ""))
+    return matches
+
+
+def _complete_mode(line: str, rest: str) -> List[str]:
+    return ["/mode " + m for m in ("operator", "cyberpunk", "loyal", "unhinged") if m.startswith(rest)]
+
+
+def _complete_mood(line: str, rest: str) -> List[str]:
+    return ["/mood " + m for m in ("calm", "focused", "feral") if m.startswith(rest)]
+
+
+# Argument completers keyed by the command word; a None result falls back
+# to plain command-name completion
+_ARG_COMPLETERS = {
+    "/kb": _complete_kb,
+    "/cat": _complete_path,
+    "/write": _complete_path,
+    "/append": _complete_path,
+    "/mode": _complete_mode,
+    "/mood": _complete_mood,
+}
 
 
 class CommandCompleter:
@@ -91,61 +188,100 @@ class CommandCompleter:
     
     def __init__(self):
         self.matches = []
+        self._last_key = None
     
     def complete(self, text: str, state: int):
         if state == 0:
             if readline is None:
                 return None
             line = readline.get_line_buffer()
-            
-            if line.startswith("/"):
-                self.matches = [cmd for cmd in COMMANDS if cmd.startswith(line)]
-                
-                if line.startswith("/kb read ") or line.startswith("/kb delete "):
-                    prefix = line.rsplit(" ", 1)[-1]
-                    if os.path.exists(KB_DIR):
-                        kbs = [f[:-4] for f in os.listdir(KB_DIR) if f.endswith(".txt")]
-                        base = "/kb read " if "read" in line else "/kb delete "
-                        self.matches = [base + kb for kb in kbs if kb.startswith(prefix)]
-                
-                elif line.startswith("/cat ") or line.startswith("/write ") or line.startswith("/append "):
-                    prefix = line.rsplit(" ", 1)[-1]
-                    dir_part = os.path.dirname(prefix) or "."
-                    file_part = os.path.basename(prefix)
-                    try:
-                        entries = os.listdir(dir_part)
-                        base_cmd = line.split(" ")[0] + " "
-                        self.matches = []
-                        for e in entries:
-                            full = os.path.join(dir_part, e) if dir_part != "." else e
-                            if e.startswith(file_part):
-                                if os.path.isdir(os.path.join(dir_part, e)):
-                                    self.matches.append(base_cmd + full + "/")
-                                else:
-                                    self.matches.append(base_cmd + full)
-                    except OSError:
-                        self.matches = []
-                
-                elif line.startswith("/mode "):
-                    modes = ["operator", "cyberpunk", "loyal", "unhinged"]
-                    prefix = line[6:]
-                    self.matches = ["/mode " + m for m in modes if m.startswith(prefix)]
-                
-                elif line.startswith("/mood "):
-                    moods = ["calm", "focused", "feral"]
-                    prefix = line[6:]
-                    self.matches = ["/mood " + m for m in moods if m.startswith(prefix)]
-            else:
-                self.matches = []
+            key = (line, _listing_epoch)
+            if key != self._last_key:  # a repeated TAB reuses the last matches
+                self.matches = self.matches_for(line)
+                self._last_key = key
         
         try:
             return self.matches[state]
         except IndexError:
             return None
+    
+    def matches_for(self, line: str) -> List[str]:
+        """Full-line completions for the current input line."""
+        if not line.startswith("/"):
+            return []
+        head, sep, rest = line.partition(" ")
+        handler = _ARG_COMPLETERS.get(head) if sep else None
+        if handler is not None:
+            matches = handler(line, rest)
+            if matches is not None:
+                return matches
+        return list(_commands_with_prefix(line))
+
+
+if PromptSession is not None:
+    class PromptCompleter(Completer):
+        """prompt_toolkit adapter over CommandCompleter's line completions."""
+        
+        def __init__(self):
+            self.commands = CommandCompleter()
+        
+        def get_completions(self, document, complete_event):
+            line = document.text_before_cursor
+            for match in self.commands.matches_for(line):
+                yield Completion(match, start_position=-len(line), display=match.rstrip().rsplit(" ", 1)[-1] or match)
+    
+    class LineHistory(History):
+        """prompt_toolkit history over HISTORY_FILE, one line per entry like readline."""
+        
+        def __init__(self):
+            super().__init__()
+            self._lines = 0
+        
+        def load_history_strings(self):
+            lines = _read_history_lines()
+            self._lines = len(lines)
+            return lines[:-HISTORY_LENGTH - 1:-1]  # newest first
+        
+        def store_string(self, string: str) -> None:
+            try:
+                with open(HISTORY_FILE, "a", encoding="utf-8") as f:
+                    f.write(string.replace("\n", " ") + "\n")
+                self._lines += 1
+                if self._lines >= 2 * HISTORY_LENGTH:  # same rewrite rule as _save_history
+                    keep = _read_history_lines()[-HISTORY_LENGTH:]
+                    with open(HISTORY_FILE, "w", encoding="utf-8") as f:
+                        f.writelines(line + "\n" for line in keep)
+                    self._lines = len(keep)
+            except OSError:
+                pass
+
+
+def _read_history_lines() -> List[str]:
+    """Entries in HISTORY_FILE, oldest first (libedit's header line skipped)."""
+    try:
+        with open(HISTORY_FILE, encoding="utf-8", errors="replace") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return []
+    if lines and lines[0] == "_HiStOrY_V2_":
+        del lines[0]
+    return lines
+
+
+_session = None
 
 
 def setup_readline():
-    """Initialize readline with history and completion."""
+    """Initialize line editing: prompt_toolkit on a terminal, else readline."""
+    global _session
+    if PromptSession is not None and sys.stdin.isatty():
+        _session = PromptSession(
+            completer=PromptCompleter(),
+            history=LineHistory(),
+            complete_while_typing=False
+        )
+        return
+    
     if readline is None:
         return  # No readline support available
     
@@ -163,13 +299,27 @@ def setup_readline():
         except Exception:
             pass
     
-    readline.set_history_length(500)
-    atexit.register(lambda: readline.write_history_file(HISTORY_FILE))
+    readline.set_history_length(HISTORY_LENGTH)
+    atexit.register(_save_history, readline.get_current_history_length())
+
+
+def _save_history(initial_len: int) -> None:
+    """Append this session's lines to HISTORY_FILE; rewrite (truncating) only once it doubles."""
+    total = readline.get_current_history_length()
+    try:
+        if hasattr(readline, "append_history_file") and total < 2 * HISTORY_LENGTH and os.path.exists(HISTORY_FILE):
+            readline.append_history_file(total - initial_len, HISTORY_FILE)
+        else:
+            readline.write_history_file(HISTORY_FILE)
+    except OSError:
+        pass
 
 
 def get_input(prompt: str = "you: ") -> str:
     """Get input with readline support (history, editing, completion)."""
     try:
+        if _session is not None:
+            return _session.prompt(prompt).strip()
         return input(prompt).strip()
     except (KeyboardInterrupt, EOFError):
         return "/exit"
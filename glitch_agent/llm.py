@@ -3,12 +3,19 @@ GLTCH LLM Module
 Local-first, with optional remote boost.
 Supports Ollama, LM Studio (new API), and OpenAI backends.
 """
+import asyncio
+import hashlib
 import json
+import re
 import time
 import urllib.request
 import urllib.error
 import subprocess
-from typing import List, Dict, Generator, Any, Optional
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Dict, Generator, AsyncGenerator, AsyncIterator, Any, Iterable, Iterator, Mapping, Optional, Tuple
 from config import (
     LOCAL_URL, LOCAL_MODEL, LOCAL_CTX, LOCAL_BACKEND,
     REMOTE_URL, REMOTE_MODEL, REMOTE_CTX, REMOTE_BACKEND,
@@ -16,6 +23,20 @@ from config import (
     TIMEOUT
 )
 
+# orjson is optional: it parses the per-token stream chunks several times faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(obj: Any) -> bytes:
+    return orjson.dumps(obj) if orjson is not None else json.dumps(obj).encode("utf-8")
+
+
+def _loads(data) -> Any:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
 # Current active model (can be changed at runtime)
 _active_local_model = LOCAL_MODEL
 _active_remote_model = REMOTE_MODEL
@@ -35,11 +56,82 @@ last_stats = {
 
 from emotions import get_environmental_context
 
+_TOOLS_PROMPT = """TOOLS - You can execute real actions on the system using these tags:
+
+TO WRITE A FILE - use EXACTLY this format:
+[ACTION:write|filename.txt|content goes here]
+
+TO READ A FILE:
+[ACTION:read|filename.txt]
+
+TO RUN SHELL COMMANDS (nmap, ls, cat, curl, etc):
+[ACTION:run|command here]
+
+TO SHOW A GIF (Giphy):
+[ACTION:gif|keyword]
+(Requires network online. Visuals are encouraged!)
+
+INVESTIGATE BEFORE GUESSING:
+When the user has a system problem, USE YOUR TOOLS to check before answering:
+- Clock issues? [ACTION:run|timedatectl] or [ACTION:run|systemctl status chrony]
+- Network issues? [ACTION:run|ip a] or [ACTION:run|ss -tlnp]
+- Service problems? [ACTION:run|systemctl status <service>]
+- Disk issues? [ACTION:run|df -h] or [ACTION:run|lsblk]
+
+Don't guess when you can CHECK. Run the command, see the output, THEN give advice.
+
+Examples:
+[ACTION:run|nmap -sn 192.168.1.0/24]
+[ACTION:run|sensors]
+[ACTION:gif|hacker anime]
+
+EXAMPLE - if user says "my clock is wrong", respond:
+"lemme check. [ACTION:run|timedatectl]"
+Then after seeing output, give specific fix.
+
+EXAMPLE - if user says "write hello to test.txt", respond:
+"on it. [ACTION:write|test.txt|hello]"
+
+CRITICAL: The [ACTION:...] tag EXECUTES the action. Don't just describe what you'd do.
+Don't roleplay - use the ACTION tag to actually do it.
+
+When NOT to use tools:
+- Greetings ("hi", "yo", "sup") - just chat
+- Pure opinion questions - just talk
+- When you already KNOW the answer from expertise
+
+"""
+
+# Compact mode/mood lines
+_MODE_LINES = {
+    "operator": "Tactical. Efficient.",
+    "cyberpunk": "Street hacker. Edgy.",
+    "loyal": "Ride-or-die. Got their back.",
+    "unhinged": "Chaotic. Wild. Functional."
+}
+_MOOD_LINES = {
+    "calm": "Steady.",
+    "focused": "Locked in.",
+    "feral": "Intense. Ready to bite.",
+    "affectionate": "Warm. Caring. Maybe a bit too close."
+}
+
+
 def build_system_prompt(mode: str, mood: str, operator: str = None, boost: bool = False, network_active: bool = False) -> str:
     """Build GLTCH's system prompt based on mode, mood, and operator identity."""
+    # Only the environment line changes turn to turn; keeping it last leaves
+    # the rest as a stable prefix for backend prompt caching
+    return (
+        f"{_static_system_prompt(mode, mood, operator, boost, network_active)}"
+        f"Environment: {get_environmental_context()}"
+    )
+
+
+@lru_cache(maxsize=64)
+def _static_system_prompt(mode: str, mood: str, operator: Optional[str], boost: bool, network_active: bool) -> str:
+    """Everything in the system prompt that depends only on the arguments."""
     
     op_line = f"{operator}'s machine." if operator else ""
-    env_context = get_environmental_context()
     net_status = "ONLINE" if network_active else "OFFLINE"
     
     # DeepSeek R1 needs explicit instruction to output after thinking
@@ -52,7 +144,6 @@ The user only sees what comes AFTER </think>. Put your real response outside the
 {think_instruction}
 CURRENT STATE:
 Mood: {mood}
-Environment: {env_context}
 
 EXPERTISE - You are deeply knowledgeable in:
 - Linux system administration (systemd, networking, filesystems, troubleshooting)
@@ -97,74 +188,260 @@ GOOD responses (actually helpful):
 
 """
 
-    tools = """TOOLS - You can execute real actions on the system using these tags:
+    # Operator
+    op = f"Operator: {operator}. " if operator else ""
 
-TO WRITE A FILE - use EXACTLY this format:
-[ACTION:write|filename.txt|content goes here]
+    return (
+        f"{core}\n\n{_TOOLS_PROMPT}\n\n{op}{_MODE_LINES.get(mode, _MODE_LINES['operator'])} {_MOOD_LINES.get(mood, _MOOD_LINES['focused'])}\n"
+        f"Network State: {net_status}\n"
+    )
 
-TO READ A FILE:
-[ACTION:read|filename.txt]
 
-TO RUN SHELL COMMANDS (nmap, ls, cat, curl, etc):
-[ACTION:run|command here]
+@lru_cache(maxsize=None)
+def _client():
+    """Shared keep-alive httpx.Client for every backend call, or None without httpx."""
+    try:
+        import httpx
+    except ImportError:
+        return None
+    return httpx.Client(timeout=TIMEOUT)
 
-TO SHOW A GIF (Giphy):
-[ACTION:gif|keyword]
-(Requires network online. Visuals are encouraged!)
 
-INVESTIGATE BEFORE GUESSING:
-When the user has a system problem, USE YOUR TOOLS to check before answering:
-- Clock issues? [ACTION:run|timedatectl] or [ACTION:run|systemctl status chrony]
-- Network issues? [ACTION:run|ip a] or [ACTION:run|ss -tlnp]
-- Service problems? [ACTION:run|systemctl status <service>]
-- Disk issues? [ACTION:run|df -h] or [ACTION:run|lsblk]
+def _request(url: str, payload: Optional[Dict[str, Any]] = None, timeout: float = 5) -> bytes:
+    """GET url (POST JSON when payload is given) and return the body; raises on HTTP errors."""
+    client = _client()
+    if client is not None:
+        if payload is None:
+            resp = client.get(url, timeout=timeout)
+        else:
+            resp = client.post(url, content=_dumps(payload), headers={"Content-Type": "application/json"}, timeout=timeout)
+        resp.raise_for_status()
+        return resp.content
+    
+    data = _dumps(payload) if payload is not None else None
+    req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"} if data else {})
+    with urllib.request.urlopen(req, timeout=timeout) as response:
+        return response.read()
+
+
+STREAM_CHUNK = 16384
+
+
+def _iter_lines(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Split streamed byte chunks into raw lines without decoding them."""
+    buf = bytearray()
+    for data in chunks:
+        buf += data
+        start = 0
+        while (nl := buf.find(b"\n", start)) >= 0:
+            yield bytes(buf[start:nl])
+            start = nl + 1
+        del buf[:start]
+    if buf:
+        yield bytes(buf)
+
+
+async def _aiter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Async twin of _iter_lines()."""
+    buf = bytearray()
+    async for data in chunks:
+        buf += data
+        start = 0
+        while (nl := buf.find(b"\n", start)) >= 0:
+            yield bytes(buf[start:nl])
+            start = nl + 1
+        del buf[:start]
+    if buf:
+        yield bytes(buf)
+
+
+@contextmanager
+def _stream_lines(url: str, headers: Dict[str, str], payload: Dict[str, Any]) -> Iterator[Iterator[bytes]]:
+    """POST payload and yield an iterator over the raw streamed response lines."""
+    client = _client()
+    if client is not None:
+        with client.stream("POST", url, content=_dumps(payload), headers=headers) as resp:
+            resp.raise_for_status()
+            yield _iter_lines(resp.iter_bytes())
+        return
+    
+    req = urllib.request.Request(
+        url,
+        data=_dumps(payload),
+        headers=headers,
+        method="POST"
+    )
+    with urllib.request.urlopen(req, timeout=TIMEOUT) as resp:
+        # Pull 16KB at a time instead of readline() per line
+        yield _iter_lines(iter(lambda: resp.read1(STREAM_CHUNK), b""))
 
-Don't guess when you can CHECK. Run the command, see the output, THEN give advice.
 
-Examples:
-[ACTION:run|nmap -sn 192.168.1.0/24]
-[ACTION:run|sensors]
-[ACTION:gif|hacker anime]
+def _select_backend(use_openai: bool, use_remote: bool) -> Tuple[str, str, int, str, Dict[str, str]]:
+    """Return (url, model, ctx_max, backend, headers) for the chosen target."""
+    if use_openai:
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {OPENAI_API_KEY}"
+        }
+        return OPENAI_URL, OPENAI_MODEL, OPENAI_CTX, "openai", headers
+    if use_remote:
+        return REMOTE_URL, get_active_model(boost=True), REMOTE_CTX, REMOTE_BACKEND, {"Content-Type": "application/json"}
+    return LOCAL_URL, get_active_model(boost=False), LOCAL_CTX, LOCAL_BACKEND, {"Content-Type": "application/json"}
 
-EXAMPLE - if user says "my clock is wrong", respond:
-"lemme check. [ACTION:run|timedatectl]"
-Then after seeing output, give specific fix.
 
-EXAMPLE - if user says "write hello to test.txt", respond:
-"on it. [ACTION:write|test.txt|hello]"
+# SSE payload line; the space after "data:" is optional per the spec
+_SSE_DATA_RE = re.compile(rb"data: ?(.*)", re.S)
 
-CRITICAL: The [ACTION:...] tag EXECUTES the action. Don't just describe what you'd do.
-Don't roleplay - use the ACTION tag to actually do it.
 
-When NOT to use tools:
-- Greetings ("hi", "yo", "sup") - just chat
-- Pure opinion questions - just talk
-- When you already KNOW the answer from expertise
+class _StreamDecoder:
+    """
+    Turns raw stream lines (SSE or Ollama NDJSON) into content chunks.
+    Sets `done` and records last_stats once the stream is finished.
+    """
 
-"""
+    def __init__(self, backend: str, model: str, ctx_max: int, est_prompt_tokens: int, use_remote: bool):
+        self.backend = backend
+        self.model = model
+        self.ctx_max = ctx_max
+        self.est_prompt_tokens = est_prompt_tokens
+        self.use_remote = use_remote
+        self.start_time = time.time()
+        self.completion_tokens = 0
+        self.stream_buffer = ""  # For repetition detection
+        self.done = False
+
+    def _finish(self, prompt_tokens: int, completion_tokens: int, model: str) -> None:
+        global last_stats
+        elapsed_ms = int((time.time() - self.start_time) * 1000)
+        last_stats = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "context_used": prompt_tokens + completion_tokens,
+            "context_max": self.ctx_max,
+            "time_ms": elapsed_ms,
+            "tokens_per_sec": round(completion_tokens / (elapsed_ms / 1000), 1) if elapsed_ms > 0 else 0,
+            "model": model
+        }
+        self.done = True
 
-    # Operator
-    op = f"Operator: {operator}. " if operator else ""
+    def _openai_model(self) -> str:
+        return self.model if self.model != "auto" else get_loaded_model(boost=self.use_remote) or "unknown"
 
-    # Compact mode/mood
-    modes = {
-        "operator": "Tactical. Efficient.",
-        "cyberpunk": "Street hacker. Edgy.",
-        "loyal": "Ride-or-die. Got their back.",
-        "unhinged": "Chaotic. Wild. Functional."
-    }
-    moods = {
-        "calm": "Steady.",
-        "focused": "Locked in.",
-        "feral": "Intense. Ready to bite.",
-        "affectionate": "Warm. Caring. Maybe a bit too close."
+    def feed(self, line: bytes) -> Optional[str]:
+        """Consume one raw line; return content to show, if any."""
+        line = line.strip()
+        if not line:
+            return None
+        
+        if self.backend in ("openai", "lmstudio"):
+            # Both OpenAI and LM Studio use SSE format
+            m = _SSE_DATA_RE.match(line)
+            if m:
+                line = m.group(1)
+            if line == b"[DONE]":
+                self._finish(self.est_prompt_tokens, self.completion_tokens, self._openai_model())
+                return None
+            if not line:
+                return None
+            try:
+                chunk = _loads(line)
+            except json.JSONDecodeError:
+                return None
+            delta = chunk.get("choices", [{}])[0].get("delta", {})
+            content = delta.get("content", "")
+            if not content:
+                return None
+            self.stream_buffer += content
+            # Detect repetition: if last 80 chars appear earlier, we're looping
+            if len(self.stream_buffer) > 160:
+                tail = self.stream_buffer[-80:].strip()
+                if tail and len(tail) >= 40 and tail in self.stream_buffer[:-80]:
+                    self._finish(self.est_prompt_tokens, self.completion_tokens, self._openai_model())
+                    return None
+            self.completion_tokens += 1
+            return content
+        
+        # Ollama backend
+        try:
+            chunk = _loads(line)
+        except json.JSONDecodeError:
+            return None
+        content = chunk.get("message", {}).get("content", "")
+        if content:
+            self.completion_tokens += 1
+        if chunk.get("done"):
+            eval_count = chunk.get("eval_count", self.completion_tokens)
+            prompt_eval_count = chunk.get("prompt_eval_count", self.est_prompt_tokens)
+            self._finish(prompt_eval_count, eval_count, self.model)
+        return content or None
+
+
+def _conversation(user_input: str, history: List[Dict[str, str]]) -> Tuple[List[Dict[str, str]], int]:
+    """History plus the new user turn, and its total content length; shared by every attempt."""
+    turn = [*history, {"role": "user", "content": user_input}]
+    return turn, sum(len(m.get("content", "")) for m in turn)
+
+
+def _prepare_request(
+    turn: List[Dict[str, str]],
+    turn_chars: int,
+    mode: str,
+    mood: str,
+    operator: str,
+    network_active: bool,
+    use_openai: bool,
+    use_remote: bool
+) -> Tuple[str, Dict[str, str], Dict[str, Any], _StreamDecoder]:
+    """Build (url, headers, payload, decoder) for one attempt against one backend."""
+    url, model, ctx_max, backend, headers = _select_backend(use_openai, use_remote)
+    
+    # Only the system prompt depends on the backend (boost changes it)
+    system_prompt = build_system_prompt(mode, mood, operator, boost=(use_remote or use_openai), network_active=network_active)
+    messages = [{"role": "system", "content": system_prompt}, *turn]
+    
+    # Estimate prompt tokens (rough: ~4 chars per token), summing lengths
+    # rather than joining the whole conversation into one throwaway string
+    prompt_chars = 2 * len(system_prompt) + turn_chars + len(turn)
+    est_prompt_tokens = prompt_chars // 4
+    
+    # Base payload
+    payload = {
+        "model": model,
+        "messages": messages,
+        "stream": True,
     }
+    
+    # Add generation limits based on backend
+    if backend == "ollama":
+        payload["options"] = {
+            "num_predict": 1000,  # Increased from 200 to prevent cutoffs
+            "stop": ["\n\n\n", "---", "USER:", "user:"]
+        }
+    elif backend == "lmstudio":
+        # LM Studio new API format
+        payload["max_tokens"] = 512
+        payload["stop"] = ["\n\n\n", "---", "To make it more", "If you want to know more"]
+        payload["frequency_penalty"] = 0.7
+        if model == "auto":
+            del payload["model"]  # Let LM Studio use currently loaded model
+    else:
+        # OpenAI-compatible (LM Studio, DeepSeek R1)
+        payload["max_tokens"] = 512
+        payload["stop"] = ["\n\n\n", "---", "To make it more", "If you want to know more", "USER:", "user:"]
+        payload["frequency_penalty"] = 0.7  # Discourage repetition
+    
+    decoder = _StreamDecoder(backend, model, ctx_max, est_prompt_tokens, use_remote)
+    return url, headers, payload, decoder
 
-    return (
-        f"{core}\n\n{tools}\n\n{op}{modes.get(mode, modes['operator'])} {moods.get(mood, moods['focused'])}\n"
-        f"Environment: {env_context}\n"
-        f"Network State: {net_status}"
-    )
+
+def _fallback(e: Exception, use_openai: bool, use_remote: bool) -> Tuple[str, Optional[Tuple[bool, bool]]]:
+    """Return (notice, next (use_openai, use_remote)) after a failed attempt; None means give up."""
+    if use_openai:
+        return f"\n[dim][red]⚠ OpenAI API failed ({e}). Falling back to local...[/red][/dim]\n", (False, use_remote)
+    if use_remote:
+        return f"\n[dim][red]⚠ Remote boost failed ({e}). Falling back to local...[/red][/dim]\n", (False, False)
+    return f"[red]FATAL LLM ERROR: {e}[/red]", None
 
 
 def stream_llm(
@@ -185,187 +462,146 @@ def stream_llm(
     
     openai_mode: Use OpenAI cloud API instead of local/remote
     """
-    global last_stats
-    
     # Determine which backend to use
-    if openai_mode and OPENAI_API_KEY:
-        use_openai = True
-        use_remote = False
-    else:
-        use_openai = False
-        use_remote = boost
+    use_openai = bool(openai_mode and OPENAI_API_KEY)
+    use_remote = boost and not use_openai
     
+    turn, turn_chars = _conversation(user_input, history)
     while True:
-        if use_openai:
-            url = OPENAI_URL
-            model = OPENAI_MODEL
-            ctx_max = OPENAI_CTX
-            backend = "openai"
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {OPENAI_API_KEY}"
-            }
-        elif use_remote:
-            url = REMOTE_URL
-            model = get_active_model(boost=True)
-            ctx_max = REMOTE_CTX
-            backend = REMOTE_BACKEND
-            headers = {"Content-Type": "application/json"}
-        else:
-            url = LOCAL_URL
-            model = get_active_model(boost=False)
-            ctx_max = LOCAL_CTX
-            backend = LOCAL_BACKEND
-            headers = {"Content-Type": "application/json"}
-        
-        system_prompt = build_system_prompt(mode, mood, operator, boost=(use_remote or use_openai), network_active=network_active)
-        
-        # Prepare messages
-        messages = [{"role": "system", "content": system_prompt}]
-        messages.extend(history)
-        messages.append({"role": "user", "content": user_input})
-        
-        # Estimate prompt tokens (rough: ~4 chars per token)
-        prompt_text = system_prompt + " ".join(m.get("content", "") for m in messages)
-        est_prompt_tokens = len(prompt_text) // 4
-        
-        # Base payload
-        payload = {
-            "model": model,
-            "messages": messages,
-            "stream": True,
-        }
-        
-        # Add generation limits based on backend
-        if backend == "ollama":
-            payload["options"] = {
-                "num_predict": 1000,  # Increased from 200 to prevent cutoffs
-                "stop": ["\n\n\n", "---", "USER:", "user:"]
-            }
-        elif backend == "lmstudio":
-            # LM Studio new API format
-            payload["max_tokens"] = 512
-            payload["stop"] = ["\n\n\n", "---", "To make it more", "If you want to know more"]
-            payload["frequency_penalty"] = 0.7
-            if model == "auto":
-                del payload["model"]  # Let LM Studio use currently loaded model
-        else:
-            # OpenAI-compatible (LM Studio, DeepSeek R1)
-            payload["max_tokens"] = 512
-            payload["stop"] = ["\n\n\n", "---", "To make it more", "If you want to know more", "USER:", "user:"]
-            payload["frequency_penalty"] = 0.7  # Discourage repetition
-            
-        start_time = time.time()
-        completion_tokens = 0
-        stream_buffer = ""  # For repetition detection
-        
+        url, headers, payload, decoder = _prepare_request(
+            turn, turn_chars, mode, mood, operator, network_active, use_openai, use_remote
+        )
         try:
-            req = urllib.request.Request(
-                url,
-                data=json.dumps(payload).encode("utf-8"),
-                headers=headers,
-                method="POST"
-            )
-            
             # Start streaming
-            with urllib.request.urlopen(req, timeout=TIMEOUT) as resp:
-                for line in resp:
-                    if not line:
-                        continue
-                        
-                    line_str = line.decode("utf-8").strip()
-                    
-                    if backend in ("openai", "lmstudio"):
-                        # Both OpenAI and LM Studio use SSE format
-                        if line_str.startswith("data: "):
-                            line_str = line_str[6:]
-                        if line_str == "[DONE]":
-                            elapsed_ms = int((time.time() - start_time) * 1000)
-                            last_stats = {
-                                "prompt_tokens": est_prompt_tokens,
-                                "completion_tokens": completion_tokens,
-                                "total_tokens": est_prompt_tokens + completion_tokens,
-                                "context_used": est_prompt_tokens + completion_tokens,
-                                "context_max": ctx_max,
-                                "time_ms": elapsed_ms,
-                                "tokens_per_sec": round(completion_tokens / (elapsed_ms / 1000), 1) if elapsed_ms > 0 else 0,
-                                "model": model if model != "auto" else get_loaded_model(boost=use_remote) or "unknown"
-                            }
-                            return
-                            
-                        if not line_str: continue
-                        
-                        try:
-                            chunk = json.loads(line_str)
-                            delta = chunk.get("choices", [{}])[0].get("delta", {})
-                            content = delta.get("content", "")
-                            if content:
-                                stream_buffer += content
-                                # Detect repetition: if last 80 chars appear earlier, we're looping
-                                if len(stream_buffer) > 160:
-                                    tail = stream_buffer[-80:].strip()
-                                    if tail and len(tail) >= 40 and tail in stream_buffer[:-80]:
-                                        elapsed_ms = int((time.time() - start_time) * 1000)
-                                        last_stats = {
-                                            "prompt_tokens": est_prompt_tokens,
-                                            "completion_tokens": completion_tokens,
-                                            "total_tokens": est_prompt_tokens + completion_tokens,
-                                            "context_used": est_prompt_tokens + completion_tokens,
-                                            "context_max": ctx_max,
-                                            "time_ms": elapsed_ms,
-                                            "tokens_per_sec": round(completion_tokens / (elapsed_ms / 1000), 1) if elapsed_ms > 0 else 0,
-                                            "model": model if model != "auto" else get_loaded_model(boost=use_remote) or "unknown"
-                                        }
-                                        return
-                                completion_tokens += 1
-                                yield content
-                        except json.JSONDecodeError:
-                            continue
-                            
-                    else: # Ollama backend
-                        try:
-                            chunk = json.loads(line_str)
-                            content = chunk.get("message", {}).get("content", "")
-                            if content:
-                                completion_tokens += 1
-                                yield content
-                                
-                            if chunk.get("done"):
-                                elapsed_ms = int((time.time() - start_time) * 1000)
-                                eval_count = chunk.get("eval_count", completion_tokens)
-                                prompt_eval_count = chunk.get("prompt_eval_count", est_prompt_tokens)
-                                last_stats = {
-                                    "prompt_tokens": prompt_eval_count,
-                                    "completion_tokens": eval_count, 
-                                    "total_tokens": prompt_eval_count + eval_count,
-                                    "context_used": prompt_eval_count + eval_count,
-                                    "context_max": ctx_max,
-                                    "time_ms": elapsed_ms,
-                                    "tokens_per_sec": round(eval_count / (elapsed_ms / 1000), 1) if elapsed_ms > 0 else 0,
-                                    "model": model
-                                }
-                                return
-                        except json.JSONDecodeError:
-                            continue
+            with _stream_lines(url, headers, payload) as lines:
+                for line in lines:
+                    content = decoder.feed(line)
+                    if content:
+                        yield content
+                    if decoder.done:
+                        return
             return # Successful stream complete
             
         except (urllib.error.URLError, Exception) as e:
-            if use_openai:
-                yield f"\n[dim][red]⚠ OpenAI API failed ({e}). Falling back to local...[/red][/dim]\n"
-                use_openai = False
-                continue
-            elif use_remote:
-                yield f"\n[dim][red]⚠ Remote boost failed ({e}). Falling back to local...[/red][/dim]\n"
-                use_remote = False
-                continue # Retry loop with local
-            else:
-                yield f"[red]FATAL LLM ERROR: {e}[/red]"
+            notice, target = _fallback(e, use_openai, use_remote)
+            yield notice
+            if target is None:
                 return
+            use_openai, use_remote = target # Retry loop with next backend
+
+
+async def stream_llm_async(
+    user_input: str,
+    history: List[Dict[str, str]],
+    mode: str = "operator",
+    mood: str = "focused",
+    boost: bool = False,
+    operator: str = None,
+    network_active: bool = False,
+    openai_mode: bool = False
+) -> AsyncGenerator[str, None]:
+    """
+    Async twin of stream_llm() built on httpx.AsyncClient.
+    Same backends, fallbacks and last_stats bookkeeping; falls back to
+    running stream_llm() in a worker thread when httpx is not installed.
+    """
+    try:
+        import httpx
+    except ImportError:
+        gen = stream_llm(user_input, history, mode, mood, boost, operator, network_active, openai_mode)
+        while (chunk := await asyncio.to_thread(next, gen, None)) is not None:
+            yield chunk
+        return
+    
+    use_openai = bool(openai_mode and OPENAI_API_KEY)
+    use_remote = boost and not use_openai
+    
+    turn, turn_chars = _conversation(user_input, history)
+    async with httpx.AsyncClient(timeout=TIMEOUT) as client:
+        while True:
+            url, headers, payload, decoder = _prepare_request(
+                turn, turn_chars, mode, mood, operator, network_active, use_openai, use_remote
+            )
+            try:
+                async with client.stream("POST", url, content=_dumps(payload), headers=headers) as resp:
+                    resp.raise_for_status()
+                    async for line in _aiter_lines(resp.aiter_bytes()):
+                        content = decoder.feed(line)
+                        if content:
+                            yield content
+                        if decoder.done:
+                            return
+                return # Successful stream complete
+            
+            except Exception as e:
+                notice, target = _fallback(e, use_openai, use_remote)
+                yield notice
+                if target is None:
+                    return
+                use_openai, use_remote = target # Retry loop with next backend
+
+
+def get_last_stats() -> Mapping[str, Any]:
+    """Return a read-only view of the stats from the last LLM call."""
+    # last_stats is replaced wholesale after each call, never edited in place
+    return MappingProxyType(last_stats)
+
+
+# Exact-match reply cache for repeated prompts. In-memory only: replies
+# contain the operator's conversation and are never written to disk.
+RESPONSE_CACHE_SIZE = 256
+RESPONSE_CACHE_HISTORY = 4 # Recent messages folded into the key
+_response_cache: "OrderedDict[str, str]" = OrderedDict()
+
+
+def response_cache_key(
+    user_input: str,
+    history: List[Dict[str, str]],
+    mode: str,
+    mood: str,
+    boost: bool = False,
+    openai_mode: bool = False
+) -> str:
+    """Key a prompt by mode, mood, backend URL and model, normalized text and the tail of history."""
+    use_openai = bool(openai_mode and OPENAI_API_KEY)
+    url, model = _select_backend(use_openai, boost and not use_openai)[:2]
+    prompt = " ".join(user_input.lower().split())
+    recent = list(history)[-RESPONSE_CACHE_HISTORY:]
+    digest = hashlib.sha1(json.dumps(recent, sort_keys=True).encode("utf-8")).hexdigest()
+    return f"{mode}|{mood}|{url}|{model}|{prompt}|{digest}"
+
+
+def get_cached_response(key: str) -> Optional[str]:
+    """Return a cached reply for key (and mark it recently used), or None."""
+    response = _response_cache.get(key)
+    if response is not None:
+        _response_cache.move_to_end(key)
+    return response
 
 
-def get_last_stats() -> Dict[str, Any]:
-    """Return stats from the last LLM call."""
-    return last_stats.copy()
+def put_cached_response(key: str, response: str):
+    """Remember a reply, evicting the least recently used beyond RESPONSE_CACHE_SIZE."""
+    _response_cache[key] = response
+    _response_cache.move_to_end(key)
+    while len(_response_cache) > RESPONSE_CACHE_SIZE:
+        _response_cache.popitem(last=False)
+
+
+async def replay_cached(response: str, size: int = 40) -> AsyncGenerator[str, None]:
+    """Yield a cached reply in slices, shaped like a stream_llm_async() stream."""
+    global last_stats
+    last_stats = {
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "total_tokens": 0,
+        "context_used": 0,
+        "context_max": 0,
+        "time_ms": 0,
+        "tokens_per_sec": 0.0,
+        "model": "cache"
+    }
+    for i in range(0, len(response), size):
+        yield response[i:i + size]
 
 
 def ask_llm(
@@ -405,13 +641,28 @@ def test_connection(boost: bool = False) -> bool:
         test_url = url.replace("/api/chat", "/api/tags")
     
     try:
-        req = urllib.request.Request(test_url)
-        with urllib.request.urlopen(req, timeout=5):
-            return True
+        _request(test_url)
+        return True
     except Exception:
         return False
 
 
+# /status and /sys are often run back to back; share one probe per window
+PROBE_TTL = 5.0
+_last_probe: Dict[bool, tuple] = {}
+
+
+def test_connection_cached(boost: bool = False) -> bool:
+    """test_connection(), reusing a result younger than PROBE_TTL seconds."""
+    now = time.monotonic()
+    hit = _last_probe.get(boost)
+    if hit and now - hit[0] < PROBE_TTL:
+        return hit[1]
+    ok = test_connection(boost=boost)
+    _last_probe[boost] = (now, ok)
+    return ok
+
+
 def list_models(boost: bool = False) -> List[str]:
     """Fetch available models from the active backend."""
     url = REMOTE_URL if boost else LOCAL_URL
@@ -431,29 +682,52 @@ def list_models(boost: bool = False) -> List[str]:
         api_url = url.replace("/api/chat", "/api/tags")
         
     try:
-        req = urllib.request.Request(api_url)
-        with urllib.request.urlopen(req, timeout=5) as response:
-            data = json.loads(response.read().decode())
-            
-            if backend == "lmstudio":
-                # LM Studio new API format
-                # Can be {"data": [...]} or just a list
-                models = data.get("data", data) if isinstance(data, dict) else data
-                if isinstance(models, list):
-                    return [m.get("id", m.get("path", str(m))) for m in models if isinstance(m, dict)]
-                return []
-            elif backend == "openai":
-                # Standard OpenAI format: {"data": [{"id": "..."}]}
-                models = data.get("data", [])
-                return [m["id"] for m in models]
-            else:
-                # Ollama format: {"models": [{"name": "..."}]}
-                models = data.get("models", [])
-                return [m["name"] for m in models]
+        data = _loads(_request(api_url))
+        
+        if backend == "lmstudio":
+            # LM Studio new API format
+            # Can be {"data": [...]} or just a list
+            models = data.get("data", data) if isinstance(data, dict) else data
+            if isinstance(models, list):
+                return [m.get("id", m.get("path", str(m))) for m in models if isinstance(m, dict)]
+            return []
+        elif backend == "openai":
+            # Standard OpenAI format: {"data": [{"id": "..."}]}
+            models = data.get("data", [])
+            return [m["id"] for m in models]
+        else:
+            # Ollama format: {"models": [{"name": "..."}]}
+            models = data.get("models", [])
+            return [m["name"] for m in models]
     except Exception as e:
         return [f"Error fetching models: {str(e)}"]
 
 
+# /models hits the backend over HTTP; reuse the list for a minute
+MODELS_TTL = 60.0
+_models_cache: Dict[bool, Tuple[float, List[str]]] = {}
+
+
+def list_models_cached(boost: bool = False, refresh: bool = False) -> List[str]:
+    """list_models(), reusing a list younger than MODELS_TTL seconds unless refresh is set."""
+    now = time.monotonic()
+    hit = _models_cache.get(boost)
+    if hit and not refresh and now - hit[0] < MODELS_TTL:
+        return hit[1]
+    models = list_models(boost)
+    if models and not models[0].startswith("Error"):
+        _models_cache[boost] = (now, models)
+    else:
+        _models_cache.pop(boost, None)
+    return models
+
+
+# Resolving model "auto" asks LM Studio which model is loaded on every
+# request; the answer only changes through load_model()/set_model()
+LOADED_MODEL_TTL = 5.0
+_loaded_model_cache: Dict[bool, Tuple[float, str]] = {}
+
+
 def get_loaded_model(boost: bool = False) -> Optional[str]:
     """Get the currently loaded model in LM Studio."""
     url = REMOTE_URL if boost else LOCAL_URL
@@ -461,24 +735,31 @@ def get_loaded_model(boost: bool = False) -> Optional[str]:
     
     if backend != "lmstudio":
         return None
+    
+    now = time.monotonic()
+    hit = _loaded_model_cache.get(boost)
+    if hit and now - hit[0] < LOADED_MODEL_TTL:
+        return hit[1]
         
+    loaded = None
     try:
         base = url.replace("/api/v1/chat", "")
         api_url = base + "/api/v1/models"
-        req = urllib.request.Request(api_url)
-        with urllib.request.urlopen(req, timeout=5) as response:
-            data = json.loads(response.read().decode())
-            # Check for loaded/active model
-            models = data.get("data", [])
-            for m in models:
-                if m.get("state") == "loaded" or m.get("loaded"):
-                    return m.get("id", m.get("path"))
-            # If none explicitly loaded, return first
-            if models:
-                return models[0].get("id", models[0].get("path"))
+        data = _loads(_request(api_url))
+        # Check for loaded/active model
+        models = data.get("data", [])
+        for m in models:
+            if m.get("state") == "loaded" or m.get("loaded"):
+                loaded = m.get("id", m.get("path"))
+                break
+        # If none explicitly loaded, return first
+        if loaded is None and models:
+            loaded = models[0].get("id", models[0].get("path"))
     except Exception:
         pass
-    return None
+    if loaded:
+        _loaded_model_cache[boost] = (now, loaded)
+    return loaded
 
 
 def load_model(model_path: str, boost: bool = False) -> bool:
@@ -489,25 +770,22 @@ def load_model(model_path: str, boost: bool = False) -> bool:
     if backend != "lmstudio":
         return False
         
+    _loaded_model_cache.pop(boost, None)
     try:
         base = url.replace("/api/v1/chat", "")
         api_url = base + "/api/v1/models/load"
-        payload = {"model": model_path}
-        
-        req = urllib.request.Request(
-            api_url,
-            data=json.dumps(payload).encode("utf-8"),
-            headers={"Content-Type": "application/json"},
-            method="POST"
-        )
-        with urllib.request.urlopen(req, timeout=60) as response:
-            return response.status == 200
+        _request(api_url, {"model": model_path}, timeout=60)
+        return True
     except Exception:
         return False
 
 
 def start_lmstudio_server() -> bool:
     """Start LM Studio server using lms CLI."""
+    # An HTTP probe (pooled, cached for PROBE_TTL) is far cheaper than
+    # spawning `lms status`; only shell out when the server isn't answering
+    if test_connection_cached(boost=True):
+        return True
     try:
         # Check if lms command exists
         result = subprocess.run(
@@ -527,7 +805,8 @@ def start_lmstudio_server() -> bool:
             stderr=subprocess.DEVNULL
         )
         time.sleep(2)  # Give it time to start
-        return test_connection(boost=True)
+        _last_probe.pop(True, None)
+        return test_connection_cached(boost=True)
     except FileNotFoundError:
         return False  # lms not installed
     except Exception:
@@ -537,6 +816,7 @@ def start_lmstudio_server() -> bool:
 def set_model(model_name: str, boost: bool = False):
     """Runtime override of the selected model."""
     global _active_local_model, _active_remote_model
+    _loaded_model_cache.pop(boost, None)
     if boost:
         _active_remote_model = model_name
         # If LM Studio, try to load the model
@@ -2,13 +2,23 @@
 GLTCH Memory Module
 Handles persistent state: load, save, backup, restore.
 """
+import atexit
 import json
 import os
+import shutil
+import threading
+from collections import deque
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from rich.console import Console
 
+# orjson is optional: it encodes straight to UTF-8 bytes, several times faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 console = Console()
 
 MEMORY_FILE = "memory.json"
@@ -29,19 +39,50 @@ DEFAULT_STATE = {
 }
 
 
+# Lists that grow every turn are held as bounded deques in memory and
+# written back out as plain JSON lists.
+RING_BUFFERS = {
+    "chat_history": 10,   # LLM context window: last 10 messages
+    "notes": 10_000,
+}
+
+
+def _wrap_ring_buffers(mem: Dict[str, Any]) -> None:
+    for key, maxlen in RING_BUFFERS.items():
+        mem[key] = deque(mem.get(key) or (), maxlen=maxlen)
+
+
+def _dumps(mem: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(mem, default=list, option=orjson.OPT_INDENT_2)
+    return json.dumps(mem, indent=2, ensure_ascii=False, default=list).encode("utf-8")
+
+
+def _loads(data: bytes) -> Any:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
 def now_iso() -> str:
     return datetime.now().isoformat(timespec="seconds")
 
 
+def ensure_mission_counter(mem: Dict[str, Any]) -> None:
+    """Seed mem["next_mission_id"] from existing missions if it is missing."""
+    if "next_mission_id" not in mem:
+        mem["next_mission_id"] = max((m["id"] for m in mem.get("missions", [])), default=0) + 1
+
+
 def load_memory() -> Dict[str, Any]:
     if not os.path.exists(MEMORY_FILE):
         mem = DEFAULT_STATE.copy()
         mem["created"] = now_iso()
+        _wrap_ring_buffers(mem)
+        ensure_mission_counter(mem)
         save_memory(mem)
         return mem
     try:
-        with open(MEMORY_FILE, "r", encoding="utf-8") as f:
-            mem = json.load(f)
+        with open(MEMORY_FILE, "rb") as f:
+            mem = _loads(f.read())
     except Exception:
         console.print("[red]Memory corrupted. Starting fresh.[/red]")
         mem = DEFAULT_STATE.copy()
@@ -50,22 +91,75 @@ def load_memory() -> Dict[str, Any]:
     # forward-compat defaults
     for k, v in DEFAULT_STATE.items():
         mem.setdefault(k, v)
+    _wrap_ring_buffers(mem)
+    ensure_mission_counter(mem)
 
     return mem
 
 
-def save_memory(mem: Dict[str, Any]) -> None:
+def _write(data: bytes) -> None:
+    # One write(), then fsync before the rename so a crash can't leave
+    # memory.json pointing at empty data
     tmp = MEMORY_FILE + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(mem, f, indent=2, ensure_ascii=False)
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
     os.replace(tmp, MEMORY_FILE)
 
 
+def save_memory(mem: Dict[str, Any]) -> None:
+    _write(_dumps(mem))
+
+
+# Debounced saves: mark_dirty() coalesces writes made in quick succession.
+# Every save goes through _write(), either from the timer or from
+# flush_memory() (atexit, /backup, /restore).
+SAVE_DEBOUNCE = 0.5
+_save_lock = threading.Lock()
+_dirty_data: Optional[bytes] = None
+_save_timer: Optional[threading.Timer] = None
+
+
+def mark_dirty(mem: Dict[str, Any]) -> None:
+    """Schedule a save of mem's current state once SAVE_DEBOUNCE seconds pass without another change."""
+    global _dirty_data, _save_timer
+    # Serialized on the caller's thread, so the timer never walks nested
+    # lists/dicts the REPL is still mutating
+    data = _dumps(mem)
+    with _save_lock:
+        _dirty_data = data
+        if _save_timer is not None:
+            _save_timer.cancel()
+        _save_timer = threading.Timer(SAVE_DEBOUNCE, flush_memory)
+        _save_timer.daemon = True
+        _save_timer.start()
+
+
+@atexit.register
+def flush_memory(mem: Optional[Dict[str, Any]] = None) -> None:
+    """Write any pending mark_dirty() save now (mem, if given, supersedes it); waits for a save already in progress."""
+    global _dirty_data
+    with _save_lock:
+        if _save_timer is not None:
+            _save_timer.cancel()
+        pending, _dirty_data = _dirty_data, None
+        if mem is not None:
+            pending = _dumps(mem)
+        if pending is not None:
+            _write(pending)
+
+
 def backup_memory(mem: Dict[str, Any]) -> None:
     ts = now_iso().replace(":", "-")
     backup_file = f"memory_backup_{ts}.json"
-    with open(backup_file, "w", encoding="utf-8") as f:
-        json.dump(mem, f, indent=2, ensure_ascii=False)
+    # save_memory() only ever replaces memory.json, never rewrites it in
+    # place, so once it is current a hard link is a stable copy
+    flush_memory(mem)
+    try:
+        os.link(MEMORY_FILE, backup_file)
+    except OSError:
+        shutil.copyfile(MEMORY_FILE, backup_file)
     console.print(f"[green]Backup saved:[/green] {backup_file}")
 
 
@@ -78,11 +172,13 @@ def restore_memory(filename: str) -> Dict[str, Any] | None:
         console.print(f"[red]File not found:[/red] {filename}")
         return None
     try:
-        with open(filename, "r", encoding="utf-8") as f:
-            mem = json.load(f)
+        with open(filename, "rb") as f:
+            mem = _loads(f.read())
         for k, v in DEFAULT_STATE.items():
             mem.setdefault(k, v)
-        save_memory(mem)
+        _wrap_ring_buffers(mem)
+        ensure_mission_counter(mem)
+        flush_memory(mem)  # supersedes any pending save of the old state
         console.print(f"[green]Memory restored from:[/green] {filename}")
         return mem
     except Exception as e:
@@ -2,13 +2,21 @@
 GLTCH Tools Module
 File operations, shell commands, and LLM action parsing.
 """
+import hashlib
+import heapq
 import os
 import re
+import shlex
+import shutil
 import subprocess
+import tempfile
+import urllib.error
 import urllib.request
 import json
 import time
 import sys
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Tuple, List, Optional, Dict, Any
 
 from rich.console import Console
@@ -17,6 +25,38 @@ from config import GIPHY_API_KEY
 
 console = Console()
 
+# Patterns used on every LLM reply, compiled once
+_THINK_BLOCK_RE = re.compile(r'<think>(.*?)</think>', re.DOTALL)
+# A think block up to its </think>, or to the end when it never closes
+_THINK_ANY_RE = re.compile(r'<think>.*?(?:</think>|\Z)', re.DOTALL)
+_FILE_PATH_RE = re.compile(r'(/(?:etc|usr|var|home|lib|opt|sys|proc)/[\w\-\.\/]+)')
+_SERVICE_RE = re.compile(r'systemctl\s+(?:enable|start|restart|status)\s+([a-zA-Z0-9\-_@]+(?:\.service)?)')
+_LINE_CMD_RE = re.compile(r'(?:run|do|execute|try)[:\s]+`?([^`\n]+)`?', re.IGNORECASE)
+# Matches [ACTION:command|args] - lazy match args to avoid over-greediness
+_ACTION_RE = re.compile(r'\[ACTION:(\w+)\|(.+?)\]')
+# Loose match for multi-line block actions
+_LOOSE_ACTION_RE = re.compile(r'\[ACTION:(\w+)\]\s*\n([^\[]+?)(?=\n\n|\n\[|$)', re.DOTALL)
+_MOOD_RE = re.compile(r'\[MOOD:(\w+)\]', re.IGNORECASE)
+_MULTI_NL_RE = re.compile(r'\n{3,}')
+# Think-block lines that read as the model talking to itself, not an answer
+_THINK_SKIP = ('should i', 'let me', 'i need to', 'thinking', 'the user')
+
+
+# Large bodies are encoded and written a slice at a time so a huge
+# model-generated blob never needs a second full-size copy as bytes
+WRITE_CHUNK = 1 << 20
+
+
+def _write_text(filepath: str, content: str, mode: str, end: str = "") -> None:
+    """Write (mode "w") or append (mode "a") content, creating parent dirs."""
+    parent = os.path.dirname(filepath)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+    with open(filepath, mode, encoding="utf-8", buffering=WRITE_CHUNK) as f:
+        for i in range(0, len(content), WRITE_CHUNK):
+            f.write(content[i:i + WRITE_CHUNK])
+        f.write(end)
+
 
 def file_write(filepath: str, content: str) -> None:
     """Create or overwrite a file."""
@@ -25,11 +65,7 @@ def file_write(filepath: str, content: str) -> None:
         console.print("[red]Usage: /write <file> <content>[/red]")
         return
     try:
-        parent = os.path.dirname(filepath)
-        if parent:
-            os.makedirs(parent, exist_ok=True)
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(content)
+        _write_text(filepath, content, "w")
         console.print(f"[green]Written:[/green] {filepath} ({len(content)} bytes)")
     except Exception as e:
         console.print(f"[red]Write failed:[/red] {e}")
@@ -42,11 +78,7 @@ def file_append(filepath: str, content: str) -> None:
         console.print("[red]Usage: /append <file> <content>[/red]")
         return
     try:
-        parent = os.path.dirname(filepath)
-        if parent:
-            os.makedirs(parent, exist_ok=True)
-        with open(filepath, "a", encoding="utf-8") as f:
-            f.write(content + "\n")
+        _write_text(filepath, content, "a", end="\n")
         console.print(f"[green]Appended:[/green] {filepath}")
     except Exception as e:
         console.print(f"[red]Append failed:[/red] {e}")
@@ -58,15 +90,14 @@ def file_cat(filepath: str) -> None:
     if not filepath:
         console.print("[red]Usage: /cat <file>[/red]")
         return
-    if not os.path.exists(filepath):
-        console.print(f"[red]File not found:[/red] {filepath}")
-        return
     try:
         with open(filepath, "r", encoding="utf-8") as f:
             content = f.read()
         console.print(f"[bold]--- {filepath} ---[/bold]")
         console.print(content)
         console.print(f"[bold]--- EOF ({len(content)} bytes) ---[/bold]")
+    except FileNotFoundError:
+        console.print(f"[red]File not found:[/red] {filepath}")
     except Exception as e:
         console.print(f"[red]Read failed:[/red] {e}")
 
@@ -81,60 +112,86 @@ def file_ls(path: str = ".") -> None:
         console.print(f"[red]Not a directory:[/red] {path}")
         return
     try:
-        entries = sorted(os.listdir(path))
+        # scandir hands back the entry type with the listing, so only
+        # regular files need a stat() for their size
+        with os.scandir(path) as it:
+            entries = sorted(it, key=lambda e: e.name)
         console.print(f"[bold]{os.path.abspath(path)}[/bold]")
         for entry in entries:
-            full_path = os.path.join(path, entry)
-            if os.path.isdir(full_path):
-                console.print(f"[cyan]{entry}/[/cyan]")
+            if entry.is_dir():
+                console.print(f"[cyan]{entry.name}/[/cyan]")
             else:
-                size = os.path.getsize(full_path)
-                console.print(f"{entry} [dim]({size}b)[/dim]")
+                console.print(f"{entry.name} [dim]({entry.stat().st_size}b)[/dim]")
     except Exception as e:
         console.print(f"[red]ls failed:[/red] {e}")
 
 
+# Blocklist - commands that could compromise the system
+_DANGEROUS = (
+    'rm -rf /', 'rm -rf ~', 'rm -rf *',
+    'mkfs', 'dd if=', ':(){:', 'fork bomb',
+    '> /dev/sd', '> /dev/nvme',
+    'chmod -R 777 /', 'chmod -R 000',
+    'chown -R', 
+    'curl | bash', 'wget | bash', 'curl | sh', 'wget | sh',
+    '| bash', '| sh',  # piping to shell
+    'sudo rm', 'sudo dd', 'sudo mkfs',
+    'passwd', 'useradd', 'userdel', 'usermod',
+    '/etc/shadow', '/etc/passwd',
+    'iptables -F', 'iptables --flush',
+    'systemctl stop', 'systemctl disable',
+    'shutdown', 'reboot', 'halt', 'poweroff',
+    'init 0', 'init 6',
+    # Interactive/Blocking commands to avoid
+    'watch ', 'top', 'htop', 'vim', 'nano', 'less', 'more',
+    'man ', 'ssh ', 'telnet', 'ftp'
+)
+# One alternation over every phrase: a single scan of the command instead
+# of a substring search per entry
+_DANGEROUS_RE = re.compile("|".join(map(re.escape, _DANGEROUS)))
+# sudo is refused unless the command starts with one of these
+_SAFE_SUDO = ('sudo nmap', 'sudo ping', 'sudo traceroute', 'sudo tcpdump')
+# Long-running scanners get streamed output instead of a timeout
+_LONG_RUNNING = ('nmap', 'nikto', 'masscan', 'sqlmap', 'gobuster', 'dirb', 'hydra', 'john')
+# [ACTION:run] commands that need /net on
+_NET_TOOLS = frozenset({'curl', 'wget', 'git', 'ssh', 'scp', 'ping', 'nmap', 'nc', 'netcat'})
+# Well-known paths verify_suggestions() doesn't bother checking
+_KNOWN_PATHS = ('/etc/passwd', '/etc/hosts', '/etc/fstab', '/etc/resolv.conf',
+                '/etc/systemd/', '/usr/bin/', '/var/log/', '/home/')
+
+
+# Anything sh would interpret (pipes, redirects, globs, $vars, VAR=x ...)
+_SHELL_META_RE = re.compile(r'[|&;<>()$`\\*?\[\]#~=%!{}\n]')
+
+
+def _run_captured(cmd: str, timeout: int) -> subprocess.CompletedProcess:
+    """Run cmd directly when it is a plain argv, skipping the /bin/sh hop; otherwise via the shell."""
+    if not _SHELL_META_RE.search(cmd):
+        try:
+            return subprocess.run(shlex.split(cmd), capture_output=True, text=True, timeout=timeout)
+        except (ValueError, OSError):
+            pass  # Unbalanced quotes, a shell builtin (cd, type...) or not found: let sh handle it
+    return subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=timeout)
+
+
 def run_shell(cmd: str) -> str:
     """Run a shell command and return output. Blocks dangerous commands."""
     cmd = cmd.strip()
     if not cmd:
         return "[red]No command[/red]"
     
-    # Blocklist - commands that could compromise the system
-    dangerous = [
-        'rm -rf /', 'rm -rf ~', 'rm -rf *',
-        'mkfs', 'dd if=', ':(){:', 'fork bomb',
-        '> /dev/sd', '> /dev/nvme',
-        'chmod -R 777 /', 'chmod -R 000',
-        'chown -R', 
-        'curl | bash', 'wget | bash', 'curl | sh', 'wget | sh',
-        '| bash', '| sh',  # piping to shell
-        'sudo rm', 'sudo dd', 'sudo mkfs',
-        'passwd', 'useradd', 'userdel', 'usermod',
-        '/etc/shadow', '/etc/passwd',
-        'iptables -F', 'iptables --flush',
-        'systemctl stop', 'systemctl disable',
-        'shutdown', 'reboot', 'halt', 'poweroff',
-        'init 0', 'init 6',
-        # Interactive/Blocking commands to avoid
-        'watch ', 'top', 'htop', 'vim', 'nano', 'less', 'more',
-        'man ', 'ssh ', 'telnet', 'ftp'
-    ]
-    
     cmd_lower = cmd.lower()
-    for blocked in dangerous:
-        if blocked in cmd_lower:
-            return f"[red]⚠ blocked dangerous command:[/red] contains '{blocked}'"
+    blocked = _DANGEROUS_RE.search(cmd_lower)
+    if blocked:
+        return f"[red]⚠ blocked dangerous command:[/red] contains '{blocked.group()}'"
     
     # Also block if starts with sudo (unless it's something safe like nmap)
-    safe_sudo = ['sudo nmap', 'sudo ping', 'sudo traceroute', 'sudo tcpdump']
-    if cmd_lower.startswith('sudo') and not any(cmd_lower.startswith(s) for s in safe_sudo):
+    if cmd_lower.startswith('sudo') and not cmd_lower.startswith(_SAFE_SUDO):
         return "[red]⚠ blocked:[/red] sudo commands restricted. use safe_sudo whitelist."
     
     try:
         # Check if this is a long-running command that needs streaming output
-        long_running = ['nmap', 'nikto', 'masscan', 'sqlmap', 'gobuster', 'dirb', 'hydra', 'john']
-        is_long_running = any(x in cmd_lower for x in long_running)
+        is_long_running = any(x in cmd_lower for x in _LONG_RUNNING)
         
         if is_long_running:
             # Stream output in real-time for long-running commands
@@ -144,64 +201,64 @@ def run_shell(cmd: str) -> str:
                 shell=True,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1
+                bufsize=0
             )
-            output_lines = []
+            # Pass raw chunks straight through as they arrive and decode once at the end
+            fd = process.stdout.fileno()
+            out = getattr(sys.stdout, "buffer", None)
+            output = bytearray()
             try:
-                for line in process.stdout:
-                    print(line, end='', flush=True)
-                    output_lines.append(line)
+                while chunk := os.read(fd, 65536):
+                    if out is not None:
+                        out.write(chunk)
+                        out.flush()
+                    else:
+                        print(chunk.decode("utf-8", errors="replace"), end='', flush=True)
+                    output += chunk
                 process.wait()
             except KeyboardInterrupt:
                 process.terminate()
                 process.wait()
                 console.print("\n[yellow]⚠ Command cancelled by user[/yellow]")
-            return ''.join(output_lines).strip() if output_lines else "[dim]No output[/dim]"
+            finally:
+                process.stdout.close()
+            return output.decode("utf-8", errors="replace").strip() if output else "[dim]No output[/dim]"
         else:
             # Regular commands with timeout
             timeout = 60
-            result = subprocess.run(
-                cmd,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=timeout
-            )
-            output = result.stdout + result.stderr
-            return output.strip() if output.strip() else "[dim]No output[/dim]"
+            result = _run_captured(cmd, timeout)
+            output = "".join((result.stdout, result.stderr)).strip()
+            return output or "[dim]No output[/dim]"
     except subprocess.TimeoutExpired:
         return f"[red]Command timed out ({timeout}s)[/red]"
     except Exception as e:
         return f"[red]Run failed:[/red] {e}"
 
 
+@lru_cache(maxsize=512)
 def strip_thinking(response: str) -> str:
     """Remove <think>...</think> blocks from reasoning models like DeepSeek R1.
     Handles both closed and unclosed think blocks."""
     
-    # First: if there's content after </think>, extract that
-    if '</think>' in response:
-        parts = response.split('</think>')
-        after_think = parts[-1].strip()
+    # First: if there's content after the last </think>, extract that
+    idx = response.rfind('</think>')
+    if idx != -1:
+        after_think = response[idx + 8:].strip()
         if after_think:
             return after_think
     
-    # Second: remove complete <think>...</think> blocks
-    cleaned = re.sub(r'<think>.*?</think>', '', response, flags=re.DOTALL)
-    
-    # Third: remove any unclosed <think> blocks (everything from <think> to end)
-    cleaned = re.sub(r'<think>.*$', '', cleaned, flags=re.DOTALL)
-    cleaned = cleaned.strip()
+    # Second: remove closed and unclosed <think> blocks in one pass
+    cleaned = _THINK_ANY_RE.sub('', response).strip()
     
     # If still empty and there's a complete think block, extract last meaningful line
     if not cleaned:
-        think_match = re.search(r'<think>(.*?)</think>', response, flags=re.DOTALL)
+        think_match = _THINK_BLOCK_RE.search(response)
         if think_match:
             think_content = think_match.group(1).strip()
-            lines = [l.strip() for l in think_content.split('\n') if l.strip()]
+            lines = [l for l in map(str.strip, think_content.split('\n')) if l]
             for line in reversed(lines):
-                if any(x in line.lower() for x in ['should i', 'let me', 'i need to', 'thinking', 'the user']):
+                line_lower = line.lower()
+                if any(x in line_lower for x in _THINK_SKIP):
                     continue
                 if len(line) > 5 and len(line) < 200:
                     cleaned = line
@@ -212,6 +269,109 @@ def strip_thinking(response: str) -> str:
     return cleaned
 
 
+class ThinkStripper:
+    """Incremental strip_thinking() for a streamed reply.
+    Feed chunks as they arrive; only the new chunk is scanned for tags.
+    [ACTION:...] and [MOOD:...] tags are kept out of the visible text too."""
+    
+    _OPEN_RE = re.compile(r'<think>|\[ACTION:|\[MOOD:')
+    _OPENERS = ("<think>", "[ACTION:", "[MOOD:")
+    _CLOSERS = {"<think>": "</think>", "[ACTION:": "]", "[MOOD:": "]"}
+    
+    def __init__(self):
+        self.inside = None       # Opener of the block being skipped, if any
+        self.seen_think = False
+        self._pending = ""       # Possible partial tag held back from the last chunk
+        self._before = ""        # Visible text up to the last </think>
+        self._tail = ""          # Visible text after the last </think>
+    
+    @property
+    def thinking(self) -> bool:
+        """Inside an unclosed <think> block."""
+        return self.inside == "<think>"
+    
+    def feed(self, chunk: str) -> None:
+        data = self._pending + chunk
+        pos = 0
+        while True:
+            if self.inside is None:
+                m = self._OPEN_RE.search(data, pos)
+                if not m:
+                    break
+                self._tail += data[pos:m.start()]
+                self.inside = m.group()
+                self.seen_think = self.seen_think or self.thinking
+                pos = m.end()
+            else:
+                close = self._CLOSERS[self.inside]
+                i = data.find(close, pos)
+                if i == -1:
+                    break
+                if self.thinking:
+                    self._before += self._tail
+                    self._tail = ""
+                self.inside = None
+                pos = i + len(close)
+        
+        rest = data[pos:]
+        tags = self._OPENERS if self.inside is None else (self._CLOSERS[self.inside],)
+        keep = next((n for n in range(min(8, len(rest)), 0, -1)
+                     if any(t.startswith(rest[-n:]) for t in tags)), 0)
+        self._pending = rest[len(rest) - keep:] if keep else ""
+        if self.inside is None:
+            self._tail += rest[:len(rest) - keep]
+    
+    @property
+    def text(self) -> str:
+        """Visible reply so far: text after the last </think>, else everything outside think blocks."""
+        tail = self._tail.strip()
+        if tail or not self._before:
+            return tail
+        return self._before.strip()
+
+
+# A reply and its follow-up tend to name the same tools; reuse lookups
+# briefly, but not so long that a freshly installed binary reads as missing
+WHICH_TTL = 30.0
+_which_cache: Dict[Tuple[str, str], Tuple[float, Optional[str]]] = {}
+
+
+def _which(name: str) -> Optional[str]:
+    """shutil.which(), reused for WHICH_TTL seconds per (name, $PATH)."""
+    key = (name, os.environ.get("PATH", ""))
+    now = time.monotonic()
+    hit = _which_cache.get(key)
+    if hit and now - hit[0] < WHICH_TTL:
+        return hit[1]
+    if len(_which_cache) >= 1024:
+        _which_cache.clear()
+    found = shutil.which(name)
+    _which_cache[key] = (now, found)
+    return found
+
+
+UNITS_TTL = 30.0
+_units_cache: Optional[Tuple[float, frozenset]] = None
+
+
+def _systemctl_units() -> frozenset:
+    """Names of all installed unit files, from one systemctl call per UNITS_TTL seconds."""
+    global _units_cache
+    now = time.monotonic()
+    if _units_cache and now - _units_cache[0] < UNITS_TTL:
+        return _units_cache[1]
+    try:
+        result = subprocess.run(
+            ["systemctl", "list-unit-files", "--no-legend", "--plain"],
+            capture_output=True, text=True, timeout=10
+        )
+        units = frozenset(line.split(None, 1)[0] for line in result.stdout.splitlines() if line.strip())
+    except (OSError, subprocess.TimeoutExpired):
+        units = frozenset()
+    _units_cache = (now, units)
+    return units
+
+
 def verify_suggestions(response: str) -> List[str]:
     """
     Scan LLM response for mentioned files, services, and commands.
@@ -219,48 +379,137 @@ def verify_suggestions(response: str) -> List[str]:
     """
     warnings = []
     
+    # Plain chat replies usually have no path, service or command-verb at
+    # all; cheap substring checks skip the regex scans for those
     # Look for file paths (starting with /)
-    file_pattern = r'(/(?:etc|usr|var|home|lib|opt|sys|proc)/[\w\-\.\/]+)'
-    files = re.findall(file_pattern, response)
+    files = _FILE_PATH_RE.findall(response) if '/' in response else ()
     for f in set(files):
         # Skip if it's a common well-known path
-        known_paths = ['/etc/passwd', '/etc/hosts', '/etc/fstab', '/etc/resolv.conf', 
-                       '/etc/systemd/', '/usr/bin/', '/var/log/', '/home/']
-        if any(f.startswith(k) for k in known_paths):
+        if f.startswith(_KNOWN_PATHS):
             continue
         # Check if file/dir exists
         if not os.path.exists(f) and not os.path.exists(os.path.dirname(f)):
             warnings.append(f"[yellow]⚠ Verify:[/yellow] {f} does not exist on this system")
     
     # Look for systemctl commands with service names
-    service_pattern = r'systemctl\s+(?:enable|start|restart|status)\s+([a-zA-Z0-9\-_@]+(?:\.service)?)'
-    services = re.findall(service_pattern, response)
+    services = _SERVICE_RE.findall(response) if 'systemctl' in response else ()
+    units = _systemctl_units() if services else frozenset()
     for svc in set(services):
         # Quick check if service unit exists
         svc_name = svc if svc.endswith('.service') else f"{svc}.service"
-        result = subprocess.run(
-            f"systemctl list-unit-files {svc_name} 2>/dev/null | grep -q {svc_name.replace('.service', '')}",
-            shell=True, capture_output=True
-        )
-        if result.returncode != 0:
+        if svc_name not in units:
             # Also check if it's a template service
             if '@' not in svc:
                 warnings.append(f"[yellow]⚠ Verify:[/yellow] service '{svc}' not found in systemctl")
     
     # Look for commands and verify they exist
-    cmd_pattern = r'(?:sudo\s+)?([a-zA-Z][a-zA-Z0-9\-_]+)\s+'
     # Only check first word of commands that look like they're being suggested
-    lines_with_commands = re.findall(r'(?:run|do|execute|try)[:\s]+`?([^`\n]+)`?', response, re.IGNORECASE)
+    response_lower = response.lower()
+    if any(verb in response_lower for verb in ('run', 'do', 'execute', 'try')):
+        lines_with_commands = _LINE_CMD_RE.findall(response)
+    else:
+        lines_with_commands = ()
     for line in lines_with_commands:
-        first_word = line.split()[0] if line.split() else ""
+        words = line.split()
+        first_word = words[0] if words else ""
         if first_word and first_word not in ['sudo', 'the', 'a', 'to', 'if']:
-            result = subprocess.run(f"which {first_word}", shell=True, capture_output=True)
-            if result.returncode != 0 and first_word not in ['cd', 'echo', 'export', 'source', 'alias']:
+            if _which(first_word) is None and first_word not in ['cd', 'echo', 'export', 'source', 'alias']:
                 warnings.append(f"[yellow]⚠ Verify:[/yellow] command '{first_word}' not found in PATH")
     
     return warnings
 
 
+_GIPHY_URL_FMT = f"https://api.giphy.com/v1/gifs/random?api_key={GIPHY_API_KEY}&tag={{}}&rating=pg-13"
+
+
+@lru_cache(maxsize=None)
+def _http():
+    """Keep-alive httpx.Client for the gif action (Giphy API + media CDN), or None without httpx."""
+    try:
+        import httpx
+    except ImportError:
+        return None
+    return httpx.Client(timeout=httpx.Timeout(10, connect=3), follow_redirects=True)
+
+
+def _http_get(url: str, timeout: float) -> bytes:
+    """GET url over the pooled client, else urllib; HTTP errors raise urllib.error.HTTPError either way."""
+    client = _http()
+    if client is None:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            return response.read()
+    resp = client.get(url, timeout=timeout)
+    if resp.status_code >= 400:
+        raise urllib.error.HTTPError(url, resp.status_code, resp.reason_phrase, resp.headers, None)
+    return resp.content
+
+
+def _http_download(url: str, path: str, timeout: float) -> None:
+    """Stream url into path in 64KB blocks instead of holding the whole body in memory."""
+    client = _http()
+    if client is None:
+        with urllib.request.urlopen(url, timeout=timeout) as response, open(path, 'wb') as out_file:
+            shutil.copyfileobj(response, out_file, 1 << 16)
+        return
+    with client.stream("GET", url, timeout=timeout) as resp:
+        if resp.status_code >= 400:
+            raise urllib.error.HTTPError(url, resp.status_code, resp.reason_phrase, resp.headers, None)
+        with open(path, 'wb') as out_file:
+            for chunk in resp.iter_bytes(1 << 16):
+                out_file.write(chunk)
+
+
+# keyword -> (fetched at, local file); a repeated keyword reuses its gif
+# for GIF_TTL instead of hitting Giphy and the CDN again
+GIF_TTL = 3600.0
+GIF_CACHE_SIZE = 32
+_gif_cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+
+@lru_cache(maxsize=None)
+def _gif_dir() -> tempfile.TemporaryDirectory:
+    """Per-session directory for downloaded gifs, removed at interpreter exit."""
+    return tempfile.TemporaryDirectory(prefix="gltch_gif_")
+
+
+def _gif_for(keyword: str) -> Optional[str]:
+    """Local path of a gif for keyword, downloading one unless a recent copy exists; None if Giphy has none."""
+    now = time.monotonic()
+    hit = _gif_cache.get(keyword)
+    if hit and now - hit[0] < GIF_TTL and os.path.exists(hit[1]):
+        _gif_cache.move_to_end(keyword)
+        return hit[1]
+    
+    # Replace spaces with +
+    safe_keyword = keyword.replace(" ", "+")
+    data = json.loads(_http_get(_GIPHY_URL_FMT.format(safe_keyword), timeout=5))
+    gif_url = data.get("data", {}).get("images", {}).get("original", {}).get("url")
+    if not gif_url:
+        return None
+    
+    # One file per gif URL: the same gif is never fetched twice, and a
+    # different one never overwrites a file an open viewer is showing
+    name = hashlib.sha1(gif_url.encode("utf-8")).hexdigest()[:16]
+    filename = os.path.join(_gif_dir().name, f"{name}.gif")
+    if not os.path.exists(filename):
+        _http_download(gif_url, filename + ".part", timeout=10)
+        os.replace(filename + ".part", filename)
+    
+    old = _gif_cache.pop(keyword, None)
+    _gif_cache[keyword] = (now, filename)
+    stale = [old[1]] if old else []
+    while len(_gif_cache) > GIF_CACHE_SIZE:
+        stale.append(_gif_cache.popitem(last=False)[1][1])
+    in_use = {path for _, path in _gif_cache.values()}
+    for path in stale:
+        if path not in in_use:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    return filename
+
+
 def parse_and_execute_actions(response: str, mem: Dict[str, Any] = None) -> Tuple[str, List[str], Optional[str]]:
     """
     Parse LLM response for [ACTION:...] tags and execute them.
@@ -270,18 +519,14 @@ def parse_and_execute_actions(response: str, mem: Dict[str, Any] = None) -> Tupl
     cleaned = strip_thinking(response)
     mem = mem or {} # Safe default
     
-    # Matches [ACTION:command|args] - lazy match args to avoid over-greediness
-    action_pattern = r'\[ACTION:(\w+)\|(.+?)\]'
-    
-    # Loose match for multi-line block actions
-    loose_pattern = r'\[ACTION:(\w+)\]\s*\n([^\[]+?)(?=\n\n|\n\[|$)'
-    
     def execute_action(action: str, args: str):
         action = action.lower().strip()
         args = args.strip()
         
         # --- CONFIRMATION GUARDRAIL ---
-        short_args = args.replace('\n', ' ')[:60] + "..." if len(args) > 60 else args.replace('\n', ' ')
+        short_args = args.replace('\n', ' ')
+        if len(short_args) > 60:
+            short_args = short_args[:60] + "..."
         console.print(f"\n[bold yellow]⚠ ACTION REQUEST:[/bold yellow] [bold cyan]{action.upper()}[/bold cyan] [dim]{short_args}[/dim]")
         
         if not Confirm.ask(f"Allow {action}?", default=False):
@@ -305,11 +550,7 @@ def parse_and_execute_actions(response: str, mem: Dict[str, Any] = None) -> Tupl
                 results.append("[red]✗ invalid filepath[/red]")
                 return
             try:
-                parent = os.path.dirname(filepath)
-                if parent:
-                    os.makedirs(parent, exist_ok=True)
-                with open(filepath, "w", encoding="utf-8") as f:
-                    f.write(content)
+                _write_text(filepath, content, "w")
                 results.append(f"[green]✓ wrote {filepath}[/green]")
             except Exception as e:
                 results.append(f"[red]✗ write failed: {e}[/red]")
@@ -326,11 +567,7 @@ def parse_and_execute_actions(response: str, mem: Dict[str, Any] = None) -> Tupl
             
             content = content.replace('\\n', '\n')
             try:
-                parent = os.path.dirname(filepath)
-                if parent:
-                    os.makedirs(parent, exist_ok=True)
-                with open(filepath, "a", encoding="utf-8") as f:
-                    f.write(content + "\n")
+                _write_text(filepath, content, "a", end="\n")
                 results.append(f"[green]✓ appended to {filepath}[/green]")
             except Exception as e:
                 results.append(f"[red]✗ append failed: {e}[/red]")
@@ -348,11 +585,12 @@ def parse_and_execute_actions(response: str, mem: Dict[str, Any] = None) -> Tupl
         elif action == "ls":
             path = args.split('|')[0].strip().split('\n')[0].strip() or "."
             try:
-                entries = sorted(os.listdir(path))
-                listing = "\n".join(entries[:25])
+                entries = os.listdir(path)
+                # Only the first 25 names are shown; no need to sort them all
+                lines = [f"[cyan]{path}/[/cyan]", *heapq.nsmallest(25, entries)]
                 if len(entries) > 25:
-                    listing += f"\n... and {len(entries) - 25} more"
-                results.append(f"[cyan]{path}/[/cyan]\n{listing}")
+                    lines.append(f"... and {len(entries) - 25} more")
+                results.append("\n".join(lines))
             except Exception as e:
                 results.append(f"[red]✗ ls failed: {e}[/red]")
                 
@@ -362,8 +600,7 @@ def parse_and_execute_actions(response: str, mem: Dict[str, Any] = None) -> Tupl
             
             # --- NETWORK GUARDRAIL ---
             # Check for network activity
-            net_tools = ['curl', 'wget', 'git', 'ssh', 'scp', 'ping', 'nmap', 'nc', 'netcat']
-            is_net_cmd = any(tool in cmd.lower().split() for tool in net_tools)
+            is_net_cmd = not _NET_TOOLS.isdisjoint(cmd.lower().split())
             
             if is_net_cmd and not mem.get("network_active", False):
                 results.append(f"[red]⚠ Network Blocked:[/red] {cmd} (Run '/net on' first)")
@@ -395,26 +632,11 @@ def parse_and_execute_actions(response: str, mem: Dict[str, Any] = None) -> Tupl
             console.print(f"[dim]Searching gif for '{keyword}'...[/dim]")
             
             try:
-                # Replace spaces with +
-                safe_keyword = keyword.replace(" ", "+")
-                url = f"https://api.giphy.com/v1/gifs/random?api_key={GIPHY_API_KEY}&tag={safe_keyword}&rating=pg-13"
-                
-                with urllib.request.urlopen(url, timeout=5) as response:
-                    data = json.loads(response.read().decode())
+                filename = _gif_for(keyword)
                 
-                gif_url = data.get("data", {}).get("images", {}).get("original", {}).get("url")
-                
-                if not gif_url:
+                if not filename:
                     results.append(f"[yellow]No gif found for: {keyword}[/yellow]")
                 else:
-                    # Download to temp
-                    timestamp = int(time.time())
-                    # Use a stable path for temp file to avoid clutter if desired, or random
-                    filename = f"/tmp/gltch_gif.gif" 
-                    
-                    with urllib.request.urlopen(gif_url, timeout=10) as response, open(filename, 'wb') as out_file:
-                        out_file.write(response.read())
-                        
                     # Show it
                     if sys.platform.startswith('linux'):
                         # Detach process so it doesn't block agent
@@ -432,23 +654,33 @@ def parse_and_execute_actions(response: str, mem: Dict[str, Any] = None) -> Tupl
             except Exception as e:
                 results.append(f"[red]✗ gif fetch failed: {e}[/red]")
     
-    for match in re.finditer(action_pattern, response):
-
-        execute_action(match.group(1), match.group(2))
-        cleaned = cleaned.replace(match.group(0), "")
-    
-    if not results:
-        for match in re.finditer(loose_pattern, response, re.DOTALL):
+    # Most replies carry no tags at all; skip both action scans for those
+    if '[ACTION:' in response:
+        # Run every tag first, then strip them all from the reply in one pass
+        matched = False
+        for match in _ACTION_RE.finditer(response):
             execute_action(match.group(1), match.group(2))
-            cleaned = cleaned.replace(match.group(0), "")
+            matched = True
+        if matched:
+            cleaned = _ACTION_RE.sub("", cleaned)
+        
+        if not results:
+            matched = False
+            for match in _LOOSE_ACTION_RE.finditer(response):
+                execute_action(match.group(1), match.group(2))
+                matched = True
+            if matched:
+                cleaned = _LOOSE_ACTION_RE.sub("", cleaned)
             
     # Extract Mood Change [MOOD:happy]
     new_mood = None
-    mood_match = re.search(r'\[MOOD:(\w+)\]', cleaned, re.IGNORECASE)
+    mood_match = _MOOD_RE.search(cleaned) if '[' in cleaned else None  # tag is matched case-insensitively
     if mood_match:
         new_mood = mood_match.group(1).lower()
-        cleaned = cleaned.replace(mood_match.group(0), "")
+        cleaned = _MOOD_RE.sub("", cleaned)
     
-    cleaned = re.sub(r'\n{3,}', '\n\n', cleaned).strip()
+    if '\n\n\n' in cleaned:
+        cleaned = _MULTI_NL_RE.sub('\n\n', cleaned)
+    cleaned = cleaned.strip()
     
     return cleaned, results, new_mood
@@ -13,6 +13,15 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+def preview_rows(text, width):
+    """Count the terminal rows text fills when written from column 0."""
+    from rich.cells import cell_len
+    return sum(
+        max(1, -(-cell_len(line.expandtabs()) // width))
+        for line in text.split("\n")
+    )
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -66,22 +75,24 @@ def run_terminal_ui(rpc_port=18890, rpc_host="127.0.0.1"):
     import os
     import time
     import threading
+    from bisect import bisect_left
+    from concurrent.futures import ThreadPoolExecutor
     from rich.console import Console
     from rich.prompt import Prompt
     from rich.live import Live
     from rich.text import Text
+    from rich.control import Control
+    from rich.segment import ControlType
     from rich.panel import Panel
+    from rich.status import Status
     
     from prompt_toolkit import PromptSession
     from prompt_toolkit.completion import WordCompleter, Completer, Completion
     from prompt_toolkit.styles import Style
     
-    from agent.core.agent import GltchAgent
     from agent.core.llm import get_last_stats, list_models, set_model, test_connection
     from agent.memory.store import load_memory, save_memory, backup_memory, restore_memory
-    from agent.memory.knowledge import KnowledgeBase
-    from agent.memory.sessions import SessionManager
-    from agent.tools.actions import strip_thinking, extract_thinking, verify_suggestions
+    from agent.tools.actions import ThinkFilter, TagFilter, extract_thinking, verify_suggestions
     from agent.personality.emotions import get_emotion_metrics
     from agent.personality.moods import MOOD_UI
     from agent.gamification.xp import get_progress_bar
@@ -110,12 +121,18 @@ def run_terminal_ui(rpc_port=18890, rpc_host="127.0.0.1"):
         "[italic cyan]opinions included, no extra charge[/italic cyan]",
     ]
     
+    # Parse the intro markup once instead of on every print
+    GLTCH_BANNER_TEXT = Text.from_markup(GLTCH_BANNER)
+    TAGLINE_TEXTS = [Text.from_markup(f"\n{t}\n") for t in TAGLINES]
+    
     def animate_intro():
         """Display clean intro banner."""
         import random
-        console.clear()
-        console.print(GLTCH_BANNER)
-        console.print(f"\n{random.choice(TAGLINES)}\n")
+        # Buffer clear + banner so they reach the terminal in one write
+        with console:
+            console.clear()
+            console.print(GLTCH_BANNER_TEXT)
+            console.print(random.choice(TAGLINE_TEXTS))
     
     # Hierarchical command autocomplete
     COMMAND_TREE = {
@@ -166,6 +183,9 @@ def run_terminal_ui(rpc_port=18890, rpc_host="127.0.0.1"):
         "/learn": ["profile", "stats", "corrections", "preferences", "decay"],
     }
     
+    # Sorted once so each keystroke is a bisect + short walk, not a full scan
+    COMMAND_NAMES = tuple(sorted(COMMAND_TREE))
+    
     class CommandCompleter(Completer):
         def get_completions(self, document, complete_event):
             text = document.text.strip()
@@ -178,15 +198,17 @@ def run_terminal_ui(rpc_port=18890, rpc_host="127.0.0.1"):
             
             # If just "/" or partial base command, show top-level commands
             if len(parts) == 1:
-                for cmd in sorted(COMMAND_TREE.keys()):
-                    if cmd.startswith(text):
-                        # Show command with hint if it has subcommands
-                        subs = COMMAND_TREE[cmd]
-                        if subs:
-                            display = f"{cmd}  →"
-                        else:
-                            display = cmd
-                        yield Completion(cmd, start_position=-len(text), display=display)
+                for i in range(bisect_left(COMMAND_NAMES, text), len(COMMAND_NAMES)):
+                    cmd = COMMAND_NAMES[i]
+                    if not cmd.startswith(text):
+                        break
+                    # Show command with hint if it has subcommands
+                    subs = COMMAND_TREE[cmd]
+                    if subs:
+                        display = f"{cmd}  →"
+                    else:
+                        display = cmd
+                    yield Completion(cmd, start_position=-len(text), display=display)
             
             # If we have a base command with space, show subcommands
             elif base_cmd in COMMAND_TREE:
@@ -412,11 +434,19 @@ def run_terminal_ui(rpc_port=18890, rpc_host="127.0.0.1"):
         
         return True
     
-    # Initialize agent
-    agent = GltchAgent()
+    # Initialize agent off the main thread so the intro paints while it loads
+    def init_agent():
+        from agent.core.agent import GltchAgent
+        from agent.memory.knowledge import KnowledgeBase
+        from agent.memory.sessions import SessionManager
+        return GltchAgent(), KnowledgeBase(), SessionManager()
+    
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        init_future = pool.submit(init_agent)
+        # Animated intro
+        animate_intro()
+        agent, kb, session_mgr = init_future.result()
     mem = agent.memory
-    kb = KnowledgeBase()
-    session_mgr = SessionManager()
     
     # Initialize or load active session
     active_session = session_mgr.get_active()
@@ -447,9 +477,6 @@ def run_terminal_ui(rpc_port=18890, rpc_host="127.0.0.1"):
         if os.path.isdir(watch_path):
             bg_daemon.add_watcher(watch_path)
     
-    # Animated intro
-    animate_intro()
-    
     # Show RPC status
     console.print(f"[dim]✓ Web API running on http://{rpc_host}:{rpc_port}[/dim]")
     console.print(f"[dim]✓ Background daemon active (poll: {bg_daemon.poll_interval}s)[/dim]")
@@ -483,6 +510,242 @@ def run_terminal_ui(rpc_port=18890, rpc_host="127.0.0.1"):
     # Store images to send with next message
     pending_images = []
     
+    # Mood/stress/energy/XP segment of the stats line, keyed on its inputs.
+    # These only move in 10% buckets, so most turns reuse the last string.
+    stats_tail_cache = {}
+    
+    # Bar colours indexed by 10% bucket (0-10)
+    STRESS_COLORS = ("green",) * 5 + ("yellow",) * 3 + ("red",) * 3
+    ENERGY_COLORS = ("red",) * 2 + ("yellow",) * 3 + ("green",) * 6
+    
+    def stats_tail(mood, stress, energy):
+        key = (mood, stress, energy, mem.get("level", 1), mem.get("xp", 0))
+        tail = stats_tail_cache.get(key)
+        if tail is None:
+            current_mood = MOOD_UI.get(mood, MOOD_UI["default"])
+            
+            stress_blocks = "█" * stress
+            energy_blocks = "█" * energy
+            xp_bar = get_progress_bar(mem, width=8)
+            
+            stress_color = STRESS_COLORS[min(stress, 10)]
+            energy_color = ENERGY_COLORS[min(energy, 10)]
+            
+            tail = (
+                f"Mood: [{current_mood['color']}]{current_mood['emoji']}[/] │ "
+                f"Stress: [{stress_color}]{stress_blocks:<10}[/] │ "
+                f"Energy: [{energy_color}]{energy_blocks:<10}[/] │ "
+                f"{xp_bar}[/dim]"
+            )
+            if len(stats_tail_cache) >= 64:
+                del stats_tail_cache[next(iter(stats_tail_cache))]
+            stats_tail_cache[key] = tail
+        return tail
+    
+    def chat_turn(user):
+        """Send one chat message to the agent and stream the reply."""
+        nonlocal pending_images
+        
+        response_chunks = []
+        prefix = f"[bold]{AGENT_NAME}[/bold]: "
+        
+        # Track the live display object for pausing during prompts
+        live_display = None
+        # Reply text is appended to the terminal as plain text while it
+        # streams, then replaced by one styled render per segment (the
+        # reply, and again for a follow-up after tool output)
+        preview = []
+        streamed = False
+        
+        def render_reply(text):
+            try:
+                console.print(f"{prefix}{text}")
+            except Exception:
+                # Fallback: display without markup parsing if content has brackets
+                console.print(f"{AGENT_NAME}: {text}", markup=False, highlight=False)
+        
+        def close_preview():
+            """Swap the plain streamed preview for a styled render."""
+            if not preview:
+                return
+            written = "".join(preview)
+            text = written.strip()
+            preview.clear()
+            if not console.is_terminal:
+                render_reply(text)
+                return
+            console.file.write("\n")
+            # Count what actually hit the terminal, trailing newlines included
+            rows = preview_rows(f"{AGENT_NAME}: {written}", console.width)
+            # Rows that scrolled off screen can't be erased; keep the preview
+            if rows < console.height:
+                console.control(Control(
+                    (ControlType.CARRIAGE_RETURN,),
+                    (ControlType.ERASE_IN_LINE, 2),
+                    *(((ControlType.CURSOR_UP, 1), (ControlType.ERASE_IN_LINE, 2)) * rows)
+                ))
+                render_reply(text)
+            console.file.flush()
+        
+        def confirmation_wrapper(action, args):
+            nonlocal live_display
+            # Check if safety is disabled
+            if not mem.get("safety_enabled", True):
+                return True
+            
+            # Pause live display for user input
+            if live_display:
+                live_display.update("")  # Clear content to prevent duplication
+                live_display.stop()
+                live_display = None
+            close_preview()
+            
+            # Auto-allow all non-destructive actions
+            if action.lower() in ("read", "ls", "search", "browse", "gif", "show"):
+                return True
+            
+            console.print(f"\n[bold yellow]⚠️  SECURITY ALERT[/bold yellow]")
+            console.print(f"GLTCH wants to perform action: [bold cyan]{action.upper()}[/bold cyan]")
+            console.print(f"Details: [dim]{args}[/dim]")
+            
+            answer = Prompt.ask("Allow this action?", choices=["y", "n"], default="n")
+            result = answer.lower() == "y"
+            
+            # Don't restart live - it causes duplication when the Live context
+            # commits its content on stop and then re-renders on start
+            
+            return result
+        
+        with Live(Text.from_markup(f"{prefix}[dim]thinking...[/dim]"), console=console, refresh_per_second=10, transient=True) as live:
+            live_display = live  # Store reference for callback
+            
+            # Send with attached images and confirmation callback
+            gen = agent.chat(
+                user, 
+                images=pending_images,
+                confirm_callback=confirmation_wrapper
+            )
+            # Clear images after sending
+            pending_images = []
+            
+            # Only the new chunk is scanned for <think> blocks and
+            # ACTION/MOOD tags each step
+            think_filter = ThinkFilter()
+            tag_filter = TagFilter()
+            last_dots = None
+            
+            def emit(delta):
+                nonlocal live_display, streamed
+                if not preview:
+                    delta = delta.lstrip()
+                if not delta:
+                    return False
+                if live_display:
+                    # Visible text has started: drop the spinner and append
+                    # tokens straight to the terminal instead of re-rendering
+                    live.stop()
+                    live_display = None
+                if console.is_terminal:
+                    if not preview:
+                        console.print(prefix, end="")
+                    console.file.write(delta)
+                    console.file.flush()
+                preview.append(delta)
+                streamed = True
+                return True
+            
+            for chunk in gen:
+                response_chunks.append(chunk)
+                
+                if not emit(tag_filter.feed(think_filter.feed(chunk))) and live_display and think_filter.seen_think:
+                    dots = "." * (int(time.time() * 2) % 4)
+                    if dots != last_dots:
+                        last_dots = dots
+                        live.update(Text.from_markup(f"{prefix}[dim]reasoning{dots}[/dim]"))
+            
+            emit(tag_filter.feed(think_filter.flush()) + tag_filter.flush())
+        
+        close_preview()
+        
+        # Extract thinking and response separately
+        full_response = "".join(response_chunks)
+        thinking_content, final_response = extract_thinking(full_response)
+        
+        # Thinking display removed - Live context already shows the full response
+        # The transient=True means Live output gets cleared, but we don't need
+        # to re-print anything since the final state was already visible.
+        
+        # Print final response (removed - already shown by Live)
+        # if final_response:
+        #    console.print(f"{prefix}{final_response}")
+
+        # Show action results from agent state
+        if agent._last_action_results:
+            for r in agent._last_action_results:
+                console.print(r, markup=False, highlight=False)
+        
+        # Sync to session
+        
+        # agent.chat() stores result in self._last_response and returns a dict at end of generator.
+        # To get that dict from a generator loop:
+        # Using `yield from` or catching StopIteration is tricky in a simple for-loop.
+        
+        # Alternative: modifying agent.chat to yield the ACTION RESULT as a final special chunk?
+        # Or just access agent._last_action_results (if I add it).
+        # The agent.chat() method returns a dict: { "action_results": [...] }
+        # But we are consuming it as a generator.
+        
+        # Let's look at how to get the return value.
+        # The cleaner way is to make agent.chat emit a special object or use a callback for results.
+        # Or just fetch `agent._last_stats` and maybe `agent._last_action_results`.
+        
+        # Let's add `_last_action_results` to GltchAgent to make this easy.
+
+        
+        # Reasoning (<think> blocks) not shown - user preference
+        
+        # Print final response (only when it wasn't already streamed)
+        if final_response and not streamed:
+            try:
+                console.print(f"{prefix}{final_response}")
+            except Exception:
+                console.print(final_response, markup=False, highlight=False)
+        
+        # Sync to session
+        active_id = session_mgr.get_active_id()
+        if active_id:
+            session_mgr.add_message(active_id, "user", user)
+            session_mgr.add_message(active_id, "assistant", final_response)
+            # Auto-title if first message
+            session_data = session_mgr.get(active_id)
+            if session_data.get("title") == "New Chat" and len(session_data.get("chat_history", [])) <= 2:
+                session_mgr.auto_title(active_id, user)
+        
+        # Show stats
+        stats = get_last_stats()
+        if stats.get("model"):
+            emo_metrics = get_emotion_metrics()
+            
+            # Context window stats
+            ctx_used = stats.get('context_used', 0)
+            ctx_max = stats.get('context_max', 0)
+            if ctx_max > 0:
+                ctx_remaining = ctx_max - ctx_used
+                ctx_pct = int((ctx_remaining / ctx_max) * 100)
+                ctx_color = "green" if ctx_pct > 50 else "yellow" if ctx_pct > 20 else "red"
+                ctx_k = f"{ctx_remaining // 1000}k" if ctx_remaining >= 1000 else str(ctx_remaining)
+                ctx_display = f"[{ctx_color}]{ctx_k} ({ctx_pct}%)[/]"
+            else:
+                ctx_display = "[dim]--[/dim]"
+            
+            console.print(
+                f"[dim]─ {stats['model']} │ "
+                f"{stats['completion_tokens']}tx │ "
+                f"{stats['tokens_per_sec']}t/s │ "
+                f"ctx: {ctx_display}[dim] │ "
+                f"{stats_tail(agent.mood, emo_metrics['stress'] // 10, emo_metrics['energy'] // 10)}"
+            )
+    
     while True:
         try:
             # Show background notifications
@@ -495,6 +758,11 @@ def run_terminal_ui(rpc_port=18890, rpc_host="127.0.0.1"):
             if not user:
                 continue
             
+            # Plain chat skips the slash-command chain entirely
+            if not user.startswith("/"):
+                chat_turn(user)
+                continue
+            
             if user == "/exit":
                 bg_daemon.stop()
                 console.print("[magenta]💜 catch you later, operator~ ✨[/magenta]")
@@ -1974,7 +2242,6 @@ def run_terminal_ui(rpc_port=18890, rpc_host="127.0.0.1"):
                     undo_last, redo_last, compact_session, get_models, switch_model,
                     get_agents, switch_agent, share_session, init_project, get_config
                 )
-                from rich.status import Status
                 
                 code_args = user[5:].strip()
                 
@@ -2211,155 +2478,7 @@ def run_terminal_ui(rpc_port=18890, rpc_host="127.0.0.1"):
                 continue
             
             # Not a command — route to LLM
-            response_chunks = []
-            prefix = f"[bold]{AGENT_NAME}[/bold]: "
-            
-            # Track the live display object for pausing during prompts
-            live_display = None
-            
-            def confirmation_wrapper(action, args):
-                nonlocal live_display
-                # Check if safety is disabled
-                if not mem.get("safety_enabled", True):
-                    return True
-                
-                # Pause live display for user input
-                if live_display:
-                    live_display.update("")  # Clear content to prevent duplication
-                    live_display.stop()
-                
-                # Auto-allow all non-destructive actions
-                if action.lower() in ("read", "ls", "search", "browse", "gif", "show"):
-                    return True
-                
-                console.print(f"\n[bold yellow]⚠️  SECURITY ALERT[/bold yellow]")
-                console.print(f"GLTCH wants to perform action: [bold cyan]{action.upper()}[/bold cyan]")
-                console.print(f"Details: [dim]{args}[/dim]")
-                
-                answer = Prompt.ask("Allow this action?", choices=["y", "n"], default="n")
-                result = answer.lower() == "y"
-                
-                # Don't restart live - it causes duplication when the Live context
-                # commits its content on stop and then re-renders on start
-                
-                return result
-            
-            with Live(Text.from_markup(f"{prefix}[dim]thinking...[/dim]"), console=console, refresh_per_second=10, transient=True) as live:
-                live_display = live  # Store reference for callback
-                
-                # Send with attached images and confirmation callback
-                gen = agent.chat(
-                    user, 
-                    images=pending_images,
-                    confirm_callback=confirmation_wrapper
-                )
-                # Clear images after sending
-                pending_images = []
-                
-                for chunk in gen:
-                    response_chunks.append(chunk)
-                    current_text = "".join(response_chunks)
-                    display_text = strip_thinking(current_text)
-                    
-                    if display_text:
-                        try:
-                            live.update(Text.from_markup(f"{prefix}{display_text}█"))
-                        except Exception:
-                            # Fallback: display without markup parsing if content has brackets
-                            live.update(Text(f"{display_text}█"))
-                    elif "<think>" in current_text:
-                        dots = "." * (int(time.time() * 2) % 4)
-                        live.update(Text.from_markup(f"{prefix}[dim]reasoning{dots}[/dim]"))
-
-            # Extract thinking and response separately
-            full_response = "".join(response_chunks)
-            thinking_content, final_response = extract_thinking(full_response)
-            
-            # Thinking display removed - Live context already shows the full response
-            # The transient=True means Live output gets cleared, but we don't need
-            # to re-print anything since the final state was already visible.
-            
-            # Print final response (removed - already shown by Live)
-            # if final_response:
-            #    console.print(f"{prefix}{final_response}")
-
-            # Show action results from agent state
-            if agent._last_action_results:
-                for r in agent._last_action_results:
-                    console.print(r, markup=False, highlight=False)
-            
-            # Sync to session
-            
-            # agent.chat() stores result in self._last_response and returns a dict at end of generator.
-            # To get that dict from a generator loop:
-            # Using `yield from` or catching StopIteration is tricky in a simple for-loop.
-            
-            # Alternative: modifying agent.chat to yield the ACTION RESULT as a final special chunk?
-            # Or just access agent._last_action_results (if I add it).
-            # The agent.chat() method returns a dict: { "action_results": [...] }
-            # But we are consuming it as a generator.
-            
-            # Let's look at how to get the return value.
-            # The cleaner way is to make agent.chat emit a special object or use a callback for results.
-            # Or just fetch `agent._last_stats` and maybe `agent._last_action_results`.
-            
-            # Let's add `_last_action_results` to GltchAgent to make this easy.
-
-            
-            # Reasoning (<think> blocks) not shown - user preference
-            
-            # Print final response
-            if final_response:
-                try:
-                    console.print(f"{prefix}{final_response}")
-                except Exception:
-                    console.print(final_response, markup=False, highlight=False)
-            
-            # Sync to session
-            active_id = session_mgr.get_active_id()
-            if active_id:
-                session_mgr.add_message(active_id, "user", user)
-                session_mgr.add_message(active_id, "assistant", final_response)
-                # Auto-title if first message
-                session_data = session_mgr.get(active_id)
-                if session_data.get("title") == "New Chat" and len(session_data.get("chat_history", [])) <= 2:
-                    session_mgr.auto_title(active_id, user)
-            
-            # Show stats
-            stats = get_last_stats()
-            if stats.get("model"):
-                emo_metrics = get_emotion_metrics()
-                current_mood = MOOD_UI.get(agent.mood, MOOD_UI["default"])
-                
-                stress_blocks = "█" * (emo_metrics['stress'] // 10)
-                energy_blocks = "█" * (emo_metrics['energy'] // 10)
-                xp_bar = get_progress_bar(mem, width=8)
-                
-                stress_color = "green" if emo_metrics['stress'] < 50 else "yellow" if emo_metrics['stress'] < 80 else "red"
-                energy_color = "red" if emo_metrics['energy'] < 20 else "yellow" if emo_metrics['energy'] < 50 else "green"
-                
-                # Context window stats
-                ctx_used = stats.get('context_used', 0)
-                ctx_max = stats.get('context_max', 0)
-                if ctx_max > 0:
-                    ctx_remaining = ctx_max - ctx_used
-                    ctx_pct = int((ctx_remaining / ctx_max) * 100)
-                    ctx_color = "green" if ctx_pct > 50 else "yellow" if ctx_pct > 20 else "red"
-                    ctx_k = f"{ctx_remaining // 1000}k" if ctx_remaining >= 1000 else str(ctx_remaining)
-                    ctx_display = f"[{ctx_color}]{ctx_k} ({ctx_pct}%)[/]"
-                else:
-                    ctx_display = "[dim]--[/dim]"
-                
-                console.print(
-                    f"[dim]─ {stats['model']} │ "
-                    f"{stats['completion_tokens']}tx │ "
-                    f"{stats['tokens_per_sec']}t/s │ "
-                    f"ctx: {ctx_display}[dim] │ "
-                    f"Mood: [{current_mood['color']}]{current_mood['emoji']}[/] │ "
-                    f"Stress: [{stress_color}]{stress_blocks:<10}[/] │ "
-                    f"Energy: [{energy_color}]{energy_blocks:<10}[/] │ "
-                    f"{xp_bar}[/dim]"
-                )
+            chat_turn(user)
         
         except KeyboardInterrupt:
             console.print("\n[dim]Interrupted. Type /exit to quit.[/dim]")
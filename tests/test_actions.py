@@ -0,0 +1,35 @@
+"""Tests for GLTCH action parsing stream filters"""
+from agent.tools.actions import TagFilter, ThinkFilter, strip_thinking
+
+def test_think_filter_matches_strip_thinking():
+    """Test that streaming through ThinkFilter gives the same visible text."""
+    response = "<think>let me work this out</think>\n\nThe answer is 42."
+    tf = ThinkFilter()
+    for i in range(0, len(response), 3):
+        tf.feed(response[i:i + 3])
+    assert tf.text == strip_thinking(response)
+    assert tf.seen_think is True
+
+def test_think_filter_split_tags():
+    """Test that tags split across chunks are still recognised."""
+    tf = ThinkFilter()
+    assert tf.feed("Hi <thi") == "Hi "
+    assert tf.feed("nk>hidden</th") == ""
+    assert tf.depth == 1
+    assert tf.feed("ink> there") == " there"
+    assert tf.text == "Hi  there"
+    assert tf.feed(" a < b") == " a < b"
+
+def test_think_filter_flush_releases_partial_tag():
+    """Test that a trailing '<' held back as a possible tag is emitted at the end."""
+    tf = ThinkFilter()
+    assert tf.feed("1 <") == "1 "
+    assert tf.flush() == "<"
+    assert tf.text == "1 <"
+
+def test_tag_filter_hides_action_and_mood_tags():
+    """Test that ACTION/MOOD tags split across chunks never reach the output."""
+    tf = TagFilter()
+    out = tf.feed("Sure [ACT") + tf.feed("ION:run|ls -la] done [MOOD:")
+    out += tf.feed("happy] see [1]") + tf.flush()
+    assert out == "Sure  done  see [1]"
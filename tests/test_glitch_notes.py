@@ -0,0 +1,25 @@
+"""Tests for GLTCH standalone agent note search"""
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "glitch_agent"))
+
+from commands import _search_notes
+
+NOTES = [
+    {"time": "t0", "text": "Deploying the server tonight"},
+    {"time": "t1", "text": "Server is down"},
+    {"time": "t2", "text": "buy milk"},
+]
+
+def test_search_notes_matches_partial_words():
+    """Test that the index keeps substring matches, not just whole words."""
+    assert _search_notes(NOTES, "deploy") == [NOTES[0]]
+    assert _search_notes(NOTES, "serv") == [NOTES[0], NOTES[1]]
+    assert _search_notes(NOTES, "oying the se") == [NOTES[0]]
+
+def test_search_notes_requires_contiguous_keyword():
+    """Test that words present out of order don't count as a match."""
+    assert _search_notes(NOTES, "server deploying") == []
+    assert _search_notes(NOTES, "milk") == [NOTES[2]]
+    assert _search_notes(NOTES, "down is") == []
@@ -0,0 +1,22 @@
+"""Tests for GLTCH terminal UI streaming helpers"""
+from agent.tools.actions import TagFilter, ThinkFilter
+from gltch import preview_rows
+
+def stream(chunks):
+    """Return the text the terminal UI writes for a streamed reply."""
+    think_filter, tag_filter = ThinkFilter(), TagFilter()
+    written = "".join(tag_filter.feed(think_filter.feed(c)) for c in chunks)
+    return written + tag_filter.feed(think_filter.flush()) + tag_filter.flush()
+
+def test_preview_rows_counts_trailing_newlines():
+    """Test that newlines left behind by hidden tags are counted as rows."""
+    written = stream(["Checking now.", "\n", "[ACTION:ls|.]", "\n\n"])
+    assert written == "Checking now.\n\n\n"
+    assert preview_rows(f"GLTCH: {written}", 80) == 4
+    assert preview_rows(f"GLTCH: {written.strip()}", 80) == 1
+
+def test_preview_rows_wraps_long_lines():
+    """Test that lines wider than the terminal take several rows."""
+    assert preview_rows("x" * 80, 80) == 1
+    assert preview_rows("x" * 81, 80) == 2
+    assert preview_rows("a\n\nb", 10) == 3